@@ -14,7 +14,7 @@ import subprocess
 import sys
 import time
 
-from common import build_simctl_command, resolve_udid
+from common import build_simctl_command, invalidate_tree_cache, resolve_udid
 from common.env_config import env_float, env_int
 
 RELAUNCH_DELAY_SECONDS = env_float("IOS_SIM_RELAUNCH_DELAY_MS", 1000.0) / 1000.0
@@ -44,6 +44,7 @@ class AppLauncher:
         if wait_for_debugger:
             cmd.insert(3, "--wait-for-debugger")  # Insert after "launch" operation
 
+        invalidate_tree_cache(self.udid)
         try:
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             # Parse PID from output if available
@@ -70,6 +71,7 @@ class AppLauncher:
         """
         cmd = build_simctl_command("terminate", self.udid, bundle_id)
 
+        invalidate_tree_cache(self.udid)
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             return True
@@ -88,6 +90,7 @@ class AppLauncher:
         """
         cmd = build_simctl_command("install", self.udid, app_path)
 
+        invalidate_tree_cache(self.udid)
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             return True
@@ -106,6 +109,7 @@ class AppLauncher:
         """
         cmd = build_simctl_command("uninstall", self.udid, bundle_id)
 
+        invalidate_tree_cache(self.udid)
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             return True
@@ -124,6 +128,7 @@ class AppLauncher:
         """
         cmd = build_simctl_command("openurl", self.udid, url)
 
+        invalidate_tree_cache(self.udid)
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             return True
@@ -10,8 +10,12 @@ Usage: python scripts/app_state_capture.py [options]
 
 import argparse
 import json
+import shutil
 import subprocess
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -21,9 +25,13 @@ from common import (
     get_accessibility_tree,
     resolve_udid,
 )
+from common.device_utils import list_simulators
 from common.env_config import env_int
+from common.json_utils import dumps_json
 
 STATE_SUBPROCESS_TIMEOUT = env_int("IOS_SIM_STATE_SUBPROCESS_TIMEOUT", 15)
+# How long to keep reading stdout once the command has exited or been killed
+TAIL_DRAIN_SECONDS = 2
 
 
 class AppStateCapture:
@@ -35,6 +43,7 @@ class AppStateCapture:
         udid: str | None = None,
         inline: bool = False,
         screenshot_size: str = "half",
+        pretty: bool = False,
     ):
         """
         Initialize state capture.
@@ -44,11 +53,14 @@ class AppStateCapture:
             udid: Optional device UDID (uses booted if not specified)
             inline: If True, return screenshots as base64 (for vision-based automation)
             screenshot_size: 'full', 'half', 'quarter', 'thumb' (default: 'half')
+            pretty: Indent the accessibility tree JSON (compact by default; trees
+                with thousands of nodes serialize 2-3x larger when indented)
         """
         self.app_bundle_id = app_bundle_id
         self.udid = udid
         self.inline = inline
         self.screenshot_size = screenshot_size
+        self.pretty = pretty
 
     def capture_screenshot(self, output_path: Path) -> bool:
         """Capture screenshot of current screen."""
@@ -74,8 +86,7 @@ class AppStateCapture:
             tree = get_accessibility_tree(self.udid, nested=True)
 
             # Save tree
-            with open(output_path, "w") as f:
-                json.dump(tree, f, indent=2)
+            output_path.write_bytes(dumps_json(tree, indent=self.pretty))
 
             # Return summary using shared utility
             return {"captured": True, "element_count": count_elements(tree)}
@@ -112,27 +123,18 @@ class AppStateCapture:
         )
 
         try:
-            result = subprocess.run(
-                cmd,
-                check=False,
-                capture_output=True,
-                text=True,
-                timeout=STATE_SUBPROCESS_TIMEOUT,
-            )
-            logs = result.stdout
-
-            # Limit lines for token efficiency
-            lines = logs.split("\n")
-            if len(lines) > line_limit:
-                lines = lines[-line_limit:]
+            lines = self._tail_command(cmd, line_limit, STATE_SUBPROCESS_TIMEOUT)
 
             # Save logs
             with open(output_path, "w") as f:
                 f.write("\n".join(lines))
 
-            # Analyze for issues
-            warning_count = sum(1 for line in lines if "warning" in line.lower())
-            error_count = sum(1 for line in lines if "error" in line.lower())
+            # Analyze for issues: lines mentioning each, one lowercase per line
+            warning_count = error_count = 0
+            for line in lines:
+                lowered = line.lower()
+                warning_count += "warning" in lowered
+                error_count += "error" in lowered
 
             return {
                 "captured": True,
@@ -143,36 +145,69 @@ class AppStateCapture:
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             return {"captured": False, "error": str(e)}
 
-    def capture_device_info(self) -> dict:
-        """Get device information."""
-        cmd = ["xcrun", "simctl", "list", "devices", "booted"]
+    @staticmethod
+    def _tail_command(cmd: list[str], line_limit: int, timeout: float) -> list[str]:
+        """
+        Run a command and keep only the last lines of its stdout.
 
-        if self.udid:
-            # Specific device info
-            cmd = ["xcrun", "simctl", "list", "devices"]
+        `log show` for a noisy app can emit megabytes per minute; streaming
+        into a bounded deque keeps memory at O(line_limit) instead of
+        buffering everything to discard all but the tail. Children can inherit
+        the pipe and outlive the command, so the reader is only waited on for
+        TAIL_DRAIN_SECONDS after exit or kill.
 
+        Args:
+            cmd: Command to run
+            line_limit: Number of trailing lines to keep
+            timeout: Seconds before the process is killed
+
+        Returns:
+            Last line_limit lines of stdout, newlines stripped
+
+        Raises:
+            subprocess.TimeoutExpired: If the command outlived the timeout
+        """
+        tail: deque[str] = deque(maxlen=line_limit)
+        lock = threading.Lock()
+
+        def _drain(stream) -> None:
+            try:
+                for line in stream:
+                    with lock:
+                        tail.append(line)
+            finally:
+                stream.close()
+
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, errors="replace"
+        )
+        reader = threading.Thread(target=_drain, args=(proc.stdout,), daemon=True)
+        reader.start()
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            reader.join(timeout=TAIL_DRAIN_SECONDS)
+            raise
 
-            # Parse output for device info (simplified)
-            lines = result.stdout.split("\n")
-            device_info = {}
+        reader.join(timeout=TAIL_DRAIN_SECONDS)
+        with lock:
+            return [line.rstrip("\n") for line in tail]
 
-            for line in lines:
-                if "iPhone" in line or "iPad" in line:
-                    # Extract device name and state
-                    parts = line.strip().split("(")
-                    if parts:
-                        device_info["name"] = parts[0].strip()
-                        if len(parts) > 2:
-                            device_info["udid"] = parts[1].replace(")", "").strip()
-                            device_info["state"] = parts[2].replace(")", "").strip()
-                    break
-
-            return device_info
-        except subprocess.CalledProcessError:
+    def capture_device_info(self) -> dict:
+        """Get device information from simctl's JSON device list."""
+        try:
+            # Booted devices only, unless a specific device was requested
+            simulators = list_simulators(state=None if self.udid else "booted")
+        except RuntimeError:
             return {}
 
+        for sim in simulators:
+            if not self.udid or sim["udid"] == self.udid:
+                return {"name": sim["name"], "udid": sim["udid"], "state": sim["state"]}
+        return {}
+
     def capture_all(
         self, output_dir: str, log_lines: int = 100, app_name: str | None = None
     ) -> dict:
@@ -189,7 +224,9 @@ class AppStateCapture:
         """
         # Create output directory (only if not in inline mode)
         output_path = Path(output_dir)
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        # One clock read so the directory name and summary timestamp agree
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d-%H%M%S")
         if not self.inline:
             capture_dir = output_path / f"app-state-{timestamp}"
             capture_dir.mkdir(parents=True, exist_ok=True)
@@ -197,20 +234,39 @@ class AppStateCapture:
             capture_dir = None
 
         summary = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "screenshot_mode": "inline" if self.inline else "file",
         }
 
         if capture_dir:
             summary["output_dir"] = str(capture_dir)
 
-        # Capture screenshot using new unified utility
-        screenshot_result = capture_screenshot(
-            self.udid,
-            size=self.screenshot_size,
-            inline=self.inline,
-            app_name=app_name,
-        )
+        # Accessibility tree and logs are written next to the screenshot (file mode only)
+        accessibility_path = capture_dir / "accessibility-tree.json" if capture_dir else None
+        logs_path = capture_dir / "app-logs.txt" if capture_dir and self.app_bundle_id else None
+
+        # Screenshot, tree, logs and device info are independent subprocesses
+        # (simctl io, idb describe-all, log show, simctl list); run them together
+        # so the capture takes as long as the slowest one rather than the sum.
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            screenshot_future = pool.submit(
+                capture_screenshot,
+                self.udid,
+                size=self.screenshot_size,
+                inline=self.inline,
+                app_name=app_name,
+            )
+            tree_future = (
+                pool.submit(self.capture_accessibility_tree, accessibility_path)
+                if accessibility_path
+                else None
+            )
+            logs_future = (
+                pool.submit(self.capture_logs, logs_path, log_lines) if logs_path else None
+            )
+            device_future = pool.submit(self.capture_device_info)
+
+            screenshot_result = screenshot_future.result()
 
         if self.inline:
             # Inline mode: store base64
@@ -225,8 +281,6 @@ class AppStateCapture:
             # File mode: save to disk
             screenshot_path = capture_dir / "screenshot.png"
             # Move temp file to target location
-            import shutil
-
             shutil.move(screenshot_result["file_path"], screenshot_path)
             summary["screenshot"] = {
                 "mode": "file",
@@ -234,29 +288,16 @@ class AppStateCapture:
                 "size_bytes": screenshot_result["size_bytes"],
             }
 
-        # Capture accessibility tree
-        if not self.inline or capture_dir:
-            accessibility_path = (capture_dir or output_path) / "accessibility-tree.json"
-        else:
-            accessibility_path = None
-
-        if accessibility_path:
-            tree_info = self.capture_accessibility_tree(accessibility_path)
-            summary["accessibility"] = tree_info
+        # Accessibility tree
+        if tree_future:
+            summary["accessibility"] = tree_future.result()
 
-        # Capture logs (if app ID provided)
-        if self.app_bundle_id:
-            if not self.inline or capture_dir:
-                logs_path = (capture_dir or output_path) / "app-logs.txt"
-            else:
-                logs_path = None
+        # Logs (if app ID provided)
+        if logs_future:
+            summary["logs"] = logs_future.result()
 
-            if logs_path:
-                log_info = self.capture_logs(logs_path, log_lines)
-                summary["logs"] = log_info
-
-        # Get device info
-        device_info = self.capture_device_info()
+        # Device info
+        device_info = device_future.result()
         if device_info:
             summary["device"] = device_info
             # Save device info (file mode only)
@@ -349,6 +390,9 @@ def main():
         help="Screenshot size for token optimization (default: half)",
     )
     parser.add_argument("--app-name", help="App name for semantic screenshot naming")
+    parser.add_argument(
+        "--pretty", action="store_true", help="Indent accessibility-tree.json (default: compact)"
+    )
 
     args = parser.parse_args()
 
@@ -365,6 +409,7 @@ def main():
         udid=udid,
         inline=args.inline,
         screenshot_size=args.size,
+        pretty=args.pretty,
     )
 
     # Capture state
@@ -19,7 +19,7 @@ import json
 import subprocess
 import sys
 
-from common import resolve_udid
+from common import invalidate_tree_cache, resolve_udid
 
 # === CONSTANTS ===
 
@@ -200,6 +200,7 @@ class AppearanceManager:
         Returns:
             (success, message)
         """
+        invalidate_tree_cache(self.udid)
         try:
             subprocess.run(
                 cmd,
@@ -221,6 +222,7 @@ class AppearanceManager:
         Returns:
             (success, message)
         """
+        invalidate_tree_cache(self.udid)
         terminate_cmd = ["xcrun", "simctl", "terminate", self.udid, bundle_id]
         # Terminate may fail if app is not running — that is acceptable
         subprocess.run(terminate_cmd, capture_output=True, check=False)
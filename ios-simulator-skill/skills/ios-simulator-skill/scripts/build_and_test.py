@@ -47,6 +47,28 @@ BUILD_LOG_PREVIEW_CHARS = env_int("IOS_SIM_BUILD_LOG_PREVIEW", 4000)
 BUILD_JSON_CAP = env_int("IOS_SIM_BUILD_JSON_CAP", 50)
 
 
+def _load_test_results(
+    cache: XCResultCache, xcresult_id: str, parser: XCResultParser, success: bool
+) -> tuple[dict | None, list[dict] | None]:
+    """
+    Get test counts and failures, reusing the bundle's cached extraction.
+
+    Returns:
+        (test_info, failed_tests) - failed_tests is None when nothing failed
+    """
+    cached = cache.get_test_summary(xcresult_id)
+    if cached is not None:
+        return cached["summary"], cached["failed_tests"]
+
+    test_info = parser.get_test_summary()
+    # Only walk the test tree when something can have failed
+    has_failures = test_info["failed"] > 0 if test_info else not success
+    failed_tests = parser.get_failed_tests() if has_failures else None
+
+    cache.save_test_summary(xcresult_id, test_info, failed_tests)
+    return test_info, failed_tests
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -84,9 +106,56 @@ Examples:
         help="Build configuration (default: Debug). Accepts any valid Xcode configuration.",
     )
     build_group.add_argument("--simulator", help="Simulator name (default: iPhone 15)")
-    build_group.add_argument("--clean", action="store_true", help="Clean before building")
+    build_group.add_argument(
+        "--clean", action="store_true", help="Clean before building (or testing)"
+    )
+    build_group.add_argument(
+        "--force",
+        action="store_true",
+        help="Run xcodebuild even if sources are unchanged since the last successful run",
+    )
+    build_group.add_argument(
+        "--jobs", type=int, help="Concurrent build tasks passed to -jobs (default: CPU count)"
+    )
+    build_group.add_argument(
+        "--no-parallelize",
+        action="store_true",
+        help="Build targets serially (e.g. for targets with link-order races)",
+    )
+    build_group.add_argument(
+        "--sign",
+        action="store_true",
+        help="Keep code signing for simulator builds (e.g. for keychain/app-group entitlements)",
+    )
+    build_group.add_argument(
+        "--pin-derived-data",
+        action="store_true",
+        help="Build into a per-project DerivedData under the skill's cache instead of Xcode's",
+    )
     build_group.add_argument("--test", action="store_true", help="Run tests")
     build_group.add_argument("--suite", help="Specific test suite to run")
+    build_group.add_argument(
+        "--reuse-test-results",
+        action="store_true",
+        help="With --test, return the last passing run if no project file changed since",
+    )
+    parallel_group = build_group.add_mutually_exclusive_group()
+    parallel_group.add_argument(
+        "--parallel-tests",
+        dest="parallel_tests",
+        action="store_true",
+        default=None,
+        help="Run tests in parallel across simulator clones (default: scheme setting)",
+    )
+    parallel_group.add_argument(
+        "--no-parallel-tests",
+        dest="parallel_tests",
+        action="store_false",
+        help="Run tests serially; faster for small unit suites where clone boot dominates",
+    )
+    build_group.add_argument(
+        "--workers", type=int, help="Parallel test workers (simulator clones) to use"
+    )
 
     # Progressive disclosure arguments
     disclosure_group = parser.add_argument_group("Progressive Disclosure Options")
@@ -148,7 +217,7 @@ Examples:
 
         # Load cached stderr for progressive disclosure
         cached_stderr = cache.get_stderr(xcresult_id)
-        parser = XCResultParser(xcresult_path, stderr=cached_stderr)
+        parser = XCResultParser(xcresult_path, stderr=cached_stderr, cache=cache)
 
         # Get errors
         if args.get_errors:
@@ -188,6 +257,9 @@ Examples:
             errors = parser.get_errors()
             warnings = parser.get_warnings()
             build_log = parser.get_build_log()
+            # Test results are only known for test bundles; read them from the cache
+            tests = cache.get_test_summary(xcresult_id)
+            test_info = tests["summary"] if tests else None
 
             if args.json:
                 import json
@@ -200,10 +272,18 @@ Examples:
                     "warnings": warnings,
                     "log_preview": build_log[:BUILD_LOG_PREVIEW_CHARS] if build_log else None,
                 }
+                if test_info:
+                    data["tests"] = test_info
+                    data["failed_tests"] = tests["failed_tests"] or []
                 print(json.dumps(data, indent=2))
             else:
                 print(f"XCResult: {xcresult_id}")
                 print(f"Errors: {error_count}, Warnings: {warning_count}")
+                if test_info:
+                    print(
+                        f"Tests: {test_info['passed']}/{test_info['total']} passed, "
+                        f"{test_info['failed']} failed"
+                    )
                 print()
                 if errors:
                     print(OutputFormatter.format_errors(errors, limit=10))
@@ -238,13 +318,24 @@ Examples:
         configuration=args.configuration,
         simulator=args.simulator,
         cache=cache,
+        jobs=args.jobs,
+        parallelize=not args.no_parallelize,
+        parallel_testing=args.parallel_tests,
+        test_workers=args.workers,
+        sign=args.sign,
+        pin_derived_data=args.pin_derived_data,
     )
 
     # Execute build or test
     if args.test:
-        success, xcresult_id, stderr = builder.test(test_suite=args.suite)
+        success, xcresult_id, stderr = builder.test(
+            test_suite=args.suite,
+            clean=args.clean,
+            force=args.force,
+            reuse=args.reuse_test_results,
+        )
     else:
-        success, xcresult_id, stderr = builder.build(clean=args.clean)
+        success, xcresult_id, stderr = builder.build(clean=args.clean, force=args.force)
 
     if not xcresult_id and not stderr:
         print("Error: Build/test failed without creating xcresult or error output", file=sys.stderr)
@@ -256,7 +347,7 @@ Examples:
 
     # Parse results
     xcresult_path = cache.get_path(xcresult_id) if xcresult_id else None
-    parser = XCResultParser(xcresult_path, stderr=stderr)
+    parser = XCResultParser(xcresult_path, stderr=stderr, cache=cache)
     error_count, warning_count = parser.count_issues()
 
     # Format output
@@ -270,16 +361,7 @@ Examples:
     test_info = None
     failed_tests = None
     if args.test and xcresult_path:
-        test_results = parser.get_test_results()
-        if test_results:
-            test_info = {
-                "total": test_results.get("total", 0),
-                "passed": test_results.get("passed", 0),
-                "failed": test_results.get("failed", 0),
-                "duration": test_results.get("duration", 0.0),
-            }
-        if not success:
-            failed_tests = parser.get_failed_tests()
+        test_info, failed_tests = _load_test_results(cache, xcresult_id, parser, success)
 
     if args.verbose:
         # Verbose mode with error/warning details
@@ -20,12 +20,14 @@ from .device_utils import (
     get_device_screen_size,
     resolve_udid,
     transform_screenshot_coords,
+    transform_screenshot_points,
 )
 from .idb_utils import (
     count_elements,
     flatten_tree,
     get_accessibility_tree,
     get_screen_size,
+    invalidate_tree_cache,
 )
 from .screenshot_utils import (
     capture_screenshot,
@@ -55,7 +57,9 @@ __all__ = [
     "get_device_screen_size",
     "get_screen_size",
     "get_size_preset",
+    "invalidate_tree_cache",
     "resize_screenshot",
     "resolve_udid",
     "transform_screenshot_coords",
+    "transform_screenshot_points",
 ]
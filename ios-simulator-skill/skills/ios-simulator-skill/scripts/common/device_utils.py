@@ -14,10 +14,79 @@ Used by:
 - test_recorder.py, app_state_capture.py - Auto-UDID detection
 """
 
+import contextlib
+import functools
 import json
+import os
+import plistlib
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from common.env_config import env_float, env_int
+from common.json_utils import loads_json
+
+# `simctl list` forks cost hundreds of ms; share the booted listing between
+# back-to-back calls and sibling scripts for this long (0 disables)
+BOOTED_CACHE_SECONDS = env_float("IOS_SIM_BOOTED_CACHE_MS", 5000.0) / 1000.0
+BOOTED_CACHE_FILE = Path(tempfile.gettempdir()) / "ios_sim_skill_booted.json"
+
+# Per-device metadata (device.plist names the device type) and the installed
+# device-type bundles whose profile.plist carries the screen geometry. Current
+# Xcode ships iOS device types inside its platform bundle instead (see
+# _xcode_device_types_dir)
+SIM_DEVICES_DIR = Path("~/Library/Developer/CoreSimulator/Devices").expanduser()
+DEVICE_TYPES_DIRS = (Path("/Library/Developer/CoreSimulator/Profiles/DeviceTypes"),)
+XCODE_DEVICE_TYPES_SUBDIR = Path(
+    "Platforms/iPhoneOS.platform/Library/Developer/CoreSimulator/Profiles/DeviceTypes"
+)
+
+# Upper bound on `simctl list` lookups; a wedged CoreSimulatorService otherwise hangs the caller
+INTROSPECT_TIMEOUT = env_int("IOS_SIM_INTROSPECT_TIMEOUT", 60)
+
+# A full simulator UDID, e.g. "ABCD1234-5678-90AB-CDEF-1234567890AB"
+_UDID_RE = re.compile(r"[0-9A-F-]{36}", re.IGNORECASE)
+
+# build_idb_command operation -> argv tokens; only a handful of distinct
+# operations ("ui tap", "ui describe-all", ...) are ever used, so split each once
+_IDB_OP_TOKENS: dict[str, tuple[str, ...]] = {}
+
+# Decodes just the root element of `idb ui describe-all` output (see _query_screen_size)
+_JSON_DECODER = json.JSONDecoder()
+
+# Last listing in this process: "booted" -> (time.monotonic() stamp, UDIDs)
+_booted_cache: dict[str, tuple[float, list[str]]] = {}
+
+
+def _run(cmd: list[str], check: bool = False, **kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run for the short-lived simctl/idb queries in this module.
+
+    CPython only takes its posix_spawn fast path (skipping fork's address
+    space copy) when the executable is an absolute path and close_fds is
+    False. Python-created fds are non-inheritable (PEP 446), so leaving
+    close_fds off leaks nothing to these children.
+    """
+    return subprocess.run(
+        cmd, executable=_resolve_executable(cmd[0]), close_fds=False, check=check, **kwargs
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_executable(name: str) -> str | None:
+    """Absolute path of a tool on PATH (None lets subprocess raise as usual)."""
+    return shutil.which(name)
+
+
+def _str_args(args: tuple) -> list[str]:
+    """Stringify command arguments, passing the (usual) str ones through untouched."""
+    # An exact-type check is cheaper than calling str() on something already a str
+    return [a if a.__class__ is str else str(a) for a in args]
 
 
 def build_simctl_command(
@@ -56,15 +125,8 @@ def build_simctl_command(
         cmd = build_simctl_command("install", "ABC123", "/path/to/app.app")
         # Returns: ["xcrun", "simctl", "install", "ABC123", "/path/to/app.app"]
     """
-    cmd = ["xcrun", "simctl", operation]
-
-    # Add device (booted or specific UDID)
-    cmd.append(udid if udid else "booted")
-
-    # Add remaining arguments
-    cmd.extend(str(arg) for arg in args)
-
-    return cmd
+    # Device (booted or specific UDID), then remaining arguments
+    return ["xcrun", "simctl", operation, udid or "booted", *_str_args(args)]
 
 
 def build_idb_command(
@@ -109,25 +171,23 @@ def build_idb_command(
         cmd = build_idb_command("ui text", None, "hello world")
         # Returns: ["idb", "ui", "text", "hello world"]
     """
-    # Split operation into parts (e.g., "ui tap" -> ["ui", "tap"])
-    cmd = ["idb"] + operation.split()
-
-    # Add arguments
-    cmd.extend(str(arg) for arg in args)
-
-    # Add device targeting if specified (optional for IDB, uses booted by default)
-    if udid:
-        cmd.extend(["--udid", udid])
-
-    return cmd
+    # Split operation into parts (e.g., "ui tap" -> ["ui", "tap"]), then arguments,
+    # then device targeting if specified (optional for IDB, uses booted by default)
+    tokens = _IDB_OP_TOKENS.get(operation)
+    if tokens is None:
+        tokens = _IDB_OP_TOKENS[operation] = tuple(operation.split())
+    return ["idb", *tokens, *_str_args(args), *(("--udid", udid) if udid else ())]
 
 
 def get_booted_device_udids() -> list[str]:
     """
     List the UDIDs of every currently booted simulator.
 
-    Queries `xcrun simctl list devices booted` and extracts each UDID in the
-    order reported.
+    Queries `xcrun simctl list devices -j booted` and collects each UDID in
+    the order reported. The listing is cached for IOS_SIM_BOOTED_CACHE_MS, in
+    memory and in a shared temp file, so scripts run back-to-back fork simctl
+    once per window. An empty listing or a failed query clears the cache
+    instead, since a simulator booted right after must be seen at once.
 
     Returns:
         UDIDs of all booted simulators, or an empty list if none are booted
@@ -137,25 +197,113 @@ def get_booted_device_udids() -> list[str]:
         udids = get_booted_device_udids()
         # ["ABC123-...", "DEF456-..."] when two simulators are running
     """
+    if BOOTED_CACHE_SECONDS > 0:
+        cached = _booted_cache.get("booted")
+        if cached and time.monotonic() - cached[0] < BOOTED_CACHE_SECONDS:
+            return list(cached[1])
+        udids = _read_booted_cache_file()
+        # A sibling's listing may predate a shutdown it didn't make; a getenv
+        # probe on the device we'd auto-select is far cheaper than re-listing
+        if udids and is_device_booted(udids[0]):
+            _booted_cache["booted"] = (time.monotonic(), udids)
+            return list(udids)
+
     try:
-        result = subprocess.run(
-            ["xcrun", "simctl", "list", "devices", "booted"],
+        result = _run(
+            ["xcrun", "simctl", "list", "devices", "-j", "booted"],
             capture_output=True,
-            text=True,
             check=True,
+            timeout=INTROSPECT_TIMEOUT,
         )
-    except subprocess.CalledProcessError:
+        # Format: {"devices": {"<runtime>": [{"udid": ..., "state": "Booted"}, ...]}}
+        data = loads_json(result.stdout)
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, json.JSONDecodeError):
+        invalidate_booted_cache()
         return []
 
-    # Format: "  iPhone 16 Pro (ABC123-DEF456) (Booted)"
-    udids: list[str] = []
-    for line in result.stdout.split("\n"):
-        match = re.search(r"\(([A-F0-9\-]{36})\)", line)
-        if match:
-            udids.append(match.group(1))
+    udids = [
+        device["udid"]
+        for devices in data.get("devices", {}).values()
+        for device in devices
+        if device.get("state") == "Booted" and device.get("udid")
+    ]
+
+    if not udids:
+        invalidate_booted_cache()
+    elif BOOTED_CACHE_SECONDS > 0:
+        _booted_cache["booted"] = (time.monotonic(), udids)
+        _write_booted_cache_file(udids)
+    return list(udids)
+
+
+def is_device_booted(udid: str) -> bool:
+    """
+    Check whether a specific simulator is booted.
+
+    `simctl getenv` only succeeds against a running device and returns in a
+    fraction of the time a full `simctl list` takes, so prefer this whenever
+    the candidate UDID is already known.
+
+    Args:
+        udid: Device UDID
+
+    Returns:
+        True if the device answered, False if it is shut down, unknown, or
+        did not respond in time.
+
+    Example:
+        if not is_device_booted(udid):
+            print(f"{udid} is not running")
+    """
+    try:
+        result = _run(
+            ["xcrun", "simctl", "getenv", udid, "HOME"],
+            capture_output=True,
+            timeout=5,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def invalidate_booted_cache() -> None:
+    """
+    Forget the cached booted-device listing in this and sibling processes.
+
+    Call after anything that boots or shuts down a simulator so the next
+    `get_booted_device_udids()` re-queries simctl instead of serving a listing
+    up to IOS_SIM_BOOTED_CACHE_MS old.
+    """
+    _booted_cache.clear()
+    with contextlib.suppress(OSError):
+        BOOTED_CACHE_FILE.unlink()
+
+
+def _read_booted_cache_file() -> list[str] | None:
+    """Return the UDIDs in the shared cache file, or None if missing, stale or corrupt."""
+    try:
+        if time.time() - BOOTED_CACHE_FILE.stat().st_mtime >= BOOTED_CACHE_SECONDS:
+            return None
+        udids = json.loads(BOOTED_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(udids, list) or not all(isinstance(u, str) for u in udids):
+        return None
     return udids
 
 
+def _write_booted_cache_file(udids: list[str]) -> None:
+    """Atomically publish a booted listing for sibling scripts (best effort)."""
+    tmp = BOOTED_CACHE_FILE.with_name(f"{BOOTED_CACHE_FILE.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(udids))
+        tmp.replace(BOOTED_CACHE_FILE)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+
+
 def get_booted_device_udid() -> str | None:
     """
     Auto-detect a booted simulator UDID.
@@ -192,9 +340,11 @@ def resolve_udid(udid_arg: str | None) -> str:
     """
     Resolve device UDID with auto-detection fallback.
 
-    If udid_arg is provided, returns it immediately.
-    If None, attempts to auto-detect booted simulator.
-    Raises error if neither is available.
+    If udid_arg is provided, returns it immediately. Otherwise the
+    IOS_SIM_UDID environment variable is used if set, so a session or
+    orchestrator that exports it once spares every script the detection.
+    If neither, attempts to auto-detect booted simulator.
+    Raises error if none is available.
 
     Args:
         udid_arg: Explicit UDID from command line, or None
@@ -216,13 +366,17 @@ def resolve_udid(udid_arg: str | None) -> str:
     if udid_arg:
         return udid_arg
 
+    env_udid = os.environ.get("IOS_SIM_UDID")
+    if env_udid:
+        return env_udid
+
     booted_udid = get_booted_device_udid()
     if booted_udid:
         return booted_udid
 
     raise RuntimeError(
         "No device UDID provided and no simulator is currently booted.\n"
-        "Boot a simulator or provide --udid explicitly:\n"
+        "Boot a simulator, provide --udid explicitly, or export IOS_SIM_UDID:\n"
         "  xcrun simctl boot <device-name>\n"
         "  python scripts/script_name.py --udid <device-udid>"
     )
@@ -230,10 +384,13 @@ def resolve_udid(udid_arg: str | None) -> str:
 
 def get_device_screen_size(udid: str) -> tuple[int, int]:
     """
-    Get actual screen dimensions for device via accessibility tree.
+    Get actual screen dimensions for device.
 
-    Queries IDB accessibility tree to determine actual device resolution.
-    Falls back to iPhone 14 defaults (390x844) if detection fails.
+    Reads the screen geometry from the simulator's device-type profile on disk
+    (no subprocess), falling back to the root frame of the IDB accessibility
+    tree, then to iPhone 14 defaults (390x844) if detection fails. Successful
+    lookups are memoized per UDID for the life of the process, so repeated
+    coordinate transforms pay for one `ui describe-all`; failures are retried.
 
     Args:
         udid: Device UDID
@@ -246,27 +403,97 @@ def get_device_screen_size(udid: str) -> tuple[int, int]:
         print(f"Device screen: {width}x{height}")
     """
     try:
-        cmd = build_idb_command("ui describe-all", udid, "--json")
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-        # Parse JSON response
-        data = json.loads(result.stdout)
-        tree = data[0] if isinstance(data, list) and len(data) > 0 else data
-
-        # Get frame size from root element
-        if tree and "frame" in tree:
-            frame = tree["frame"]
-            width = int(frame.get("width", 390))
-            height = int(frame.get("height", 844))
-            return (width, height)
-
-        # Fallback
-        return (390, 844)
+        return _query_screen_size(udid)
     except Exception:
         # Graceful fallback to iPhone 14 Pro defaults
         return (390, 844)
 
 
+@functools.lru_cache(maxsize=16)
+def _query_screen_size(udid: str) -> tuple[int, int]:
+    """Resolve the screen size in points; raises on failure so errors aren't memoized."""
+    dims = _read_device_dims_from_plist(udid)
+    if dims:
+        return dims
+
+    cmd = build_idb_command("ui describe-all", udid, "--json")
+    result = _run(cmd, capture_output=True, check=True)
+
+    # Only the root element is needed: decode the first object of the flat
+    # element array instead of every element that follows it
+    text = result.stdout.decode()
+    start = text.find("{")
+    tree = _JSON_DECODER.raw_decode(text, start)[0] if start >= 0 else None
+
+    # Get frame size from root element
+    if not tree or "frame" not in tree:
+        raise ValueError("no root frame in idb ui describe-all output")
+    frame = tree["frame"]
+    return (int(frame["width"]), int(frame["height"]))
+
+
+def _read_device_dims_from_plist(udid: str) -> tuple[int, int] | None:
+    """
+    Read screen size in points from the device type's profile.plist.
+
+    Returns:
+        (width, height), or None if the device or its device type bundle
+        can't be found or read.
+    """
+    try:
+        with (SIM_DEVICES_DIR / udid / "device.plist").open("rb") as f:
+            # e.g. "com.apple.CoreSimulator.SimDeviceType.iPhone-16-Pro"
+            device_type = plistlib.load(f)["deviceType"]
+        bundle = _find_device_type_bundle(device_type)
+        if bundle is None:
+            return None
+        with (bundle / "Contents" / "Resources" / "profile.plist").open("rb") as f:
+            profile = plistlib.load(f)
+        scale = profile.get("mainScreenScale") or 1
+        return (
+            round(profile["mainScreenWidth"] / scale),
+            round(profile["mainScreenHeight"] / scale),
+        )
+    except (OSError, plistlib.InvalidFileException, KeyError, TypeError):
+        return None
+
+
+def _find_device_type_bundle(device_type: str) -> Path | None:
+    """Locate the .simdevicetype bundle whose CFBundleIdentifier is device_type."""
+    # Bundle names usually mirror the identifier suffix ("iPhone-16-Pro" ->
+    # "iPhone 16 Pro.simdevicetype"); scan Info.plists only when they don't
+    guess = device_type.rsplit(".", 1)[-1].replace("-", " ") + ".simdevicetype"
+    xcode_dir = _xcode_device_types_dir()
+    types_dirs = (*DEVICE_TYPES_DIRS, xcode_dir) if xcode_dir else DEVICE_TYPES_DIRS
+    for types_dir in types_dirs:
+        if (types_dir / guess).is_dir():
+            return types_dir / guess
+    for types_dir in types_dirs:
+        for bundle in types_dir.glob("*.simdevicetype"):
+            try:
+                with (bundle / "Contents" / "Info.plist").open("rb") as f:
+                    if plistlib.load(f).get("CFBundleIdentifier") == device_type:
+                        return bundle
+            except (OSError, plistlib.InvalidFileException):
+                continue
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _xcode_device_types_dir() -> Path | None:
+    """Device-type bundles inside the active Xcode (`xcode-select -p`), resolved once."""
+    try:
+        result = _run(
+            ["xcode-select", "-p"], capture_output=True, text=True, timeout=INTROSPECT_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    developer_dir = result.stdout.strip()
+    if result.returncode != 0 or not developer_dir:
+        return None
+    return Path(developer_dir) / XCODE_DEVICE_TYPES_SUBDIR
+
+
 def resolve_device_identifier(identifier: str) -> str:
     """
     Resolve device name or partial UDID to full UDID.
@@ -304,7 +531,7 @@ def resolve_device_identifier(identifier: str) -> str:
         )
 
     # Check if already a full UDID (36 character UUID format)
-    if re.match(r"^[A-F0-9\-]{36}$", identifier, re.IGNORECASE):
+    if _UDID_RE.fullmatch(identifier):
         return identifier.upper()
 
     # Try to match by device name
@@ -361,7 +588,7 @@ def list_simulators(state: str | None = None) -> list[dict]:
     try:
         # Query simctl for device list
         cmd = ["xcrun", "simctl", "list", "devices", "-j"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = _run(cmd, capture_output=True, text=True, check=True, timeout=INTROSPECT_TIMEOUT)
 
         data = json.loads(result.stdout)
         simulators = []
@@ -388,7 +615,12 @@ def list_simulators(state: str | None = None) -> list[dict]:
             return simulators
         return [s for s in simulators if s["state"].lower() == state.lower()]
 
-    except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as e:
+    except (
+        subprocess.CalledProcessError,
+        subprocess.TimeoutExpired,
+        json.JSONDecodeError,
+        KeyError,
+    ) as e:
         raise RuntimeError(f"Failed to list simulators: {e}") from e
 
 
@@ -436,8 +668,11 @@ def transform_screenshot_coords(
     for accurate tapping.
 
     The transformation is linear:
-    device_x = (screenshot_x / screenshot_width) * device_width
-    device_y = (screenshot_y / screenshot_height) * device_height
+    device_x = screenshot_x * (device_width / screenshot_width)
+    device_y = screenshot_y * (device_height / screenshot_height)
+
+    Applying the precomputed scale keeps the common 2x/4x presets exact
+    (`(100 / 195) * 390` truncates to 199; `100 * 2.0` is 200).
 
     Args:
         x, y: Coordinates in the screenshot
@@ -457,6 +692,40 @@ def transform_screenshot_coords(
         print(f"Tap at device coords: ({device_x}, {device_y})")
         # Output: Tap at device coords: (200, 400)
     """
-    device_x = int((x / screenshot_width) * device_width)
-    device_y = int((y / screenshot_height) * device_height)
-    return (device_x, device_y)
+    return transform_screenshot_points(
+        [(x, y)], screenshot_width, screenshot_height, device_width, device_height
+    )[0]
+
+
+def transform_screenshot_points(
+    points: Iterable[tuple[float, float]],
+    screenshot_width: int,
+    screenshot_height: int,
+    device_width: int,
+    device_height: int,
+) -> list[tuple[int, int]]:
+    """
+    Transform several screenshot points to device coordinates in one call.
+
+    Batch form of `transform_screenshot_coords` for callers that map more
+    than one point against the same screenshot (swipe endpoints, bounding
+    box corners).
+
+    Args:
+        points: (x, y) coordinates in the screenshot
+        screenshot_width, screenshot_height: Screenshot dimensions
+        device_width, device_height: Actual device dimensions
+
+    Returns:
+        List of (device_x, device_y) tuples, in input order
+
+    Example:
+        start, end = transform_screenshot_points(
+            [(100, 200), (100, 50)], 195, 422, 390, 844
+        )
+        # start == (200, 400), end == (200, 100)
+    """
+    # Scale factors are computed once per call, leaving one multiply per axis
+    scale_x = device_width / screenshot_width
+    scale_y = device_height / screenshot_height
+    return [(int(x * scale_x), int(y * scale_y)) for x, y in points]
@@ -12,11 +12,19 @@ Used by:
 - test_recorder.py - Test documentation
 - app_state_capture.py - State snapshots
 - gesture.py - Touch gesture operations
+- keyboard.py, app_launcher.py, appearance.py - Tree cache invalidation
 """
 
+import contextlib
 import json
 import subprocess
 import sys
+from pathlib import Path
+
+from .json_utils import loads_json
+
+# navigator.py's short-lived disk copy of each device's tree (IOS_SIM_TREE_CACHE_MS)
+TREE_CACHE_DIR = Path("~/.ios-simulator-skill/trees").expanduser()
 
 
 def get_accessibility_tree(udid: str | None = None, nested: bool = True) -> dict:
@@ -53,15 +61,17 @@ def get_accessibility_tree(udid: str | None = None, nested: bool = True) -> dict
         cmd.extend(["--udid", udid])
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        tree_data = json.loads(result.stdout)
+        # Raw bytes: skips a decode pass and is what orjson parses fastest
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        tree_data = loads_json(result.stdout)
 
         # IDB returns array format, extract first element (root)
         if isinstance(tree_data, list) and len(tree_data) > 0:
             return tree_data[0]
         return tree_data
     except subprocess.CalledProcessError as e:
-        print(f"Error: Failed to get accessibility tree: {e.stderr}", file=sys.stderr)
+        stderr = e.stderr.decode(errors="replace") if e.stderr else ""
+        print(f"Error: Failed to get accessibility tree: {stderr}", file=sys.stderr)
         sys.exit(1)
     except json.JSONDecodeError:
         print("Error: Invalid JSON from idb", file=sys.stderr)
@@ -110,7 +120,7 @@ def flatten_tree(node: dict, depth: int = 0, elements: list[dict] | None = None)
     elements.append(node_copy)
 
     # Process children recursively
-    for child in node.get("children", []):
+    for child in node.get("children") or ():
         flatten_tree(child, depth + 1, elements)
 
     return elements
@@ -118,9 +128,10 @@ def flatten_tree(node: dict, depth: int = 0, elements: list[dict] | None = None)
 
 def count_elements(node: dict) -> int:
     """
-    Count total elements in tree (recursive).
+    Count total elements in tree.
 
-    Traverses entire tree counting all elements for reporting purposes.
+    Traverses entire tree counting all elements for reporting purposes. Walks
+    with an explicit stack, so deep hierarchies don't hit the recursion limit.
 
     Used by:
     - test_recorder.py - Element counting per step
@@ -137,9 +148,14 @@ def count_elements(node: dict) -> int:
         total = count_elements(tree)
         print(f"Screen has {total} elements")
     """
-    count = 1
-    for child in node.get("children", []):
-        count += count_elements(child)
+    count = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        count += 1
+        children = current.get("children")
+        if children:
+            stack.extend(children)
     return count
 
 
@@ -178,3 +194,26 @@ def get_screen_size(udid: str | None = None) -> tuple[int, int]:
     except Exception:
         # Silently fall back to defaults if tree access fails
         return (DEFAULT_WIDTH, DEFAULT_HEIGHT)
+
+
+def tree_cache_path(udid: str, cache_dir: Path | None = None) -> Path:
+    """Disk cache file for a device's accessibility tree."""
+    return (cache_dir or TREE_CACHE_DIR) / f"tree-{udid}.json"
+
+
+def invalidate_tree_cache(udid: str | None = None) -> None:
+    """
+    Drop the disk-cached accessibility tree before an action that changes the UI.
+
+    navigator.py reuses a tree fetched by an earlier invocation for up to
+    IOS_SIM_TREE_CACHE_MS; every script that taps, swipes, types, presses a
+    button or launches an app must call this first, or the next lookup taps
+    coordinates from the screen as it was before.
+
+    Args:
+        udid: Device UDID; None (the booted device) clears every device's tree
+    """
+    paths = [tree_cache_path(udid)] if udid else TREE_CACHE_DIR.glob("tree-*.json")
+    for path in paths:
+        with contextlib.suppress(OSError):
+            path.unlink()
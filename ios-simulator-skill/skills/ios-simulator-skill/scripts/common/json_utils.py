@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+JSON decoding/encoding with an optional fast backend.
+
+`idb ui describe-all` and `xcresulttool` emit large JSON documents that are
+decoded on every refresh, and accessibility trees are written back out for
+captures and caches. When `orjson` is installed it is used (several times
+faster than the stdlib on these payloads); otherwise the stdlib `json` module
+handles everything, so the skill stays zero-config.
+
+orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep
+catching `json.JSONDecodeError` regardless of backend.
+"""
+
+import json
+from typing import Any
+
+# Try to import orjson for faster decoding, but make it optional
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def loads_json(data: bytes | str) -> Any:
+    """
+    Decode a JSON document from bytes or str.
+
+    Args:
+        data: Raw JSON (bytes straight from a subprocess pipe are fastest with orjson)
+
+    Returns:
+        Decoded Python object
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """
+    Encode a JSON-compatible object to UTF-8 bytes.
+
+    Args:
+        data: Object with str keys and JSON-native values (e.g. an accessibility tree)
+        indent: Pretty-print with 2-space indentation
+
+    Returns:
+        Encoded JSON, ready for Path.write_bytes
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode()
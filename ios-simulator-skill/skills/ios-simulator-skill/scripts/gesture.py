@@ -65,8 +65,9 @@ import time
 from common import (
     get_device_screen_size,
     get_screen_size,
+    invalidate_tree_cache,
     resolve_udid,
-    transform_screenshot_coords,
+    transform_screenshot_points,
 )
 
 
@@ -143,6 +144,7 @@ class GestureController:
         if self.udid:
             cmd.extend(["--udid", self.udid])
 
+        invalidate_tree_cache(self.udid)
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             return True
@@ -184,6 +186,7 @@ class GestureController:
         if self.udid:
             cmd.extend(["--udid", self.udid])
 
+        invalidate_tree_cache(self.udid)
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             # Simulate hold with delay
@@ -331,17 +334,8 @@ def main():
                 sys.exit(1)
 
             device_w, device_h = get_device_screen_size(udid)
-            start = transform_screenshot_coords(
-                start[0],
-                start[1],
-                args.screenshot_width,
-                args.screenshot_height,
-                device_w,
-                device_h,
-            )
-            end = transform_screenshot_coords(
-                end[0],
-                end[1],
+            start, end = transform_screenshot_points(
+                [start, end],
                 args.screenshot_width,
                 args.screenshot_height,
                 device_w,
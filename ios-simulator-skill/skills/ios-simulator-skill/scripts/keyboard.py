@@ -70,7 +70,7 @@ import subprocess
 import sys
 import time
 
-from common import resolve_udid
+from common import invalidate_tree_cache, resolve_udid
 
 
 class KeyboardController:
@@ -134,6 +134,7 @@ class KeyboardController:
         if self.udid:
             cmd.extend(["--udid", self.udid])
 
+        invalidate_tree_cache(self.udid)
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             return True
@@ -164,6 +165,7 @@ class KeyboardController:
         if self.udid:
             cmd.extend(["--udid", self.udid])
 
+        invalidate_tree_cache(self.udid)
         try:
             for _ in range(count):
                 subprocess.run(cmd, capture_output=True, check=True)
@@ -202,6 +204,7 @@ class KeyboardController:
         if self.udid:
             cmd.extend(["--udid", self.udid])
 
+        invalidate_tree_cache(self.udid)
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             return True
@@ -226,6 +229,7 @@ class KeyboardController:
         if self.udid:
             cmd.extend(["--udid", self.udid])
 
+        invalidate_tree_cache(self.udid)
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             return True
@@ -34,6 +34,10 @@ Usage Examples:
     # Tap at specific coordinates (fallback)
     python scripts/navigator.py --tap-at 200,400 --udid <device-id>
 
+    # Run several operations in one process (JSON list from file or stdin)
+    echo '[{"op": "enter_text", "find_type": "TextField", "text": "bob"},
+           {"op": "tap", "find_text": "Login"}]' | python scripts/navigator.py --batch -
+
 Output Format:
     Tapped: Button "Login" at (320, 450)
     Entered text in: TextField "Username"
@@ -48,17 +52,22 @@ Navigation Priority (best to worst):
 Technical Details:
 - Uses IDB's accessibility tree via `idb ui describe-all --json --nested`
 - Caches tree for multiple operations (call with force_refresh to update)
-- Finds elements by parsing tree recursively
+- Indexes the tree by type and identifier so lookups skip unrelated nodes
+- Finds elements by walking the tree iteratively (no recursion limit)
 - Calculates tap coordinates from element frame center
 - Uses `idb ui tap` for tapping, `idb ui text` for text entry
 - Extracts data from AXLabel, AXValue, and AXUniqueId fields
 """
 
 import argparse
+import contextlib
 import json
 import subprocess
 import sys
+import time
 from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
 
 from common import (
     flatten_tree,
@@ -68,12 +77,19 @@ from common import (
     transform_screenshot_coords,
 )
 from common.env_config import env_float, env_int
+from common.idb_utils import tree_cache_path
+from common.json_utils import dumps_json, loads_json
 
 MAX_ELEMENTS_LISTED = env_int("IOS_SIM_MAX_ELEMENTS", 25)
 TAP_SETTLE_SECONDS = env_float("IOS_SIM_TAP_SETTLE_MS", 500.0) / 1000.0
+FOCUS_POLL_SECONDS = env_float("IOS_SIM_FOCUS_POLL_MS", 50.0) / 1000.0
+TREE_CACHE_SECONDS = env_float("IOS_SIM_TREE_CACHE_MS", 500.0) / 1000.0
+
+# Node keys idb/AX use to flag the element holding keyboard focus
+_FOCUS_KEYS = ("AXFocused", "focused", "hasKeyboardFocus")
 
 
-@dataclass
+@dataclass(slots=True)
 class Element:
     """Represents a UI element from accessibility tree."""
 
@@ -99,51 +115,185 @@ class Element:
         return f'{self.type} "{label}"'
 
 
+class TreeIndex:
+    """
+    Column-oriented index over the typed nodes of one accessibility tree.
+
+    Parallel lists hold each field in document order, with type, identifier
+    and exact-text maps pointing into them, so lookups scan only candidate rows and
+    Elements are built only for results.
+    """
+
+    def __init__(self, root: dict):
+        """
+        Index a tree in a single pass.
+
+        The walk and the column fill share one loop (no intermediate node
+        list or generator hop), with list appends bound to locals.
+        """
+        self.nodes: list[dict] = []
+        self.types: list[str] = []
+        self.labels: list[str | None] = []
+        self.values: list[str | None] = []
+        self.identifiers: list[str | None] = []
+        self.texts_lc: list[str] = []
+        self.enabled: list[bool] = []
+        self.by_type: dict[str, list[int]] = {}
+        self.by_id: dict[str, list[int]] = {}
+        self.by_text: dict[str, list[int]] = {}
+
+        add_node = self.nodes.append
+        add_type = self.types.append
+        add_label = self.labels.append
+        add_value = self.values.append
+        add_identifier = self.identifiers.append
+        add_text = self.texts_lc.append
+        add_enabled = self.enabled.append
+        by_type = self.by_type
+        by_id = self.by_id
+        by_text = self.by_text
+
+        # Explicit stack, children reversed to keep document order
+        row = 0
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            children = node.get("children")
+            if children:
+                stack.extend(reversed(children))
+
+            node_type = node.get("type")
+            if not node_type:
+                continue
+
+            label = node.get("AXLabel")
+            value = node.get("AXValue")
+            add_node(node)
+            add_type(node_type)
+            add_label(label)
+            add_value(value)
+            # Lowercased once here so fuzzy search is a bare substring test per row
+            add_text(f"{label or ''} {value or ''}".lower())
+            add_enabled(node.get("enabled", True))
+            by_type.setdefault(node_type, []).append(row)
+            identifier = node.get("AXUniqueId")
+            add_identifier(identifier)
+            if identifier:
+                by_id.setdefault(identifier, []).append(row)
+            # Exact-text lookups match label or value
+            if label:
+                by_text.setdefault(label, []).append(row)
+            if value and value != label:
+                by_text.setdefault(value, []).append(row)
+            row += 1
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
 class Navigator:
     """Navigates iOS apps using accessibility data."""
 
-    def __init__(self, udid: str | None = None):
-        """Initialize navigator with optional device UDID."""
+    def __init__(
+        self,
+        udid: str | None = None,
+        tree_cache: bool = True,
+        tree_cache_dir: Path | None = None,
+    ):
+        """
+        Initialize navigator.
+
+        Args:
+            udid: Device UDID
+            tree_cache: Share fetched trees across invocations via a short-lived disk cache
+            tree_cache_dir: Disk cache directory (default: common.idb_utils.TREE_CACHE_DIR)
+        """
         self.udid = udid
         self._tree_cache = None
+        self._index: TreeIndex | None = None
+        self._index_tree: dict | None = None
+        self._disk_cache = (
+            tree_cache_path(udid, tree_cache_dir)
+            if tree_cache and udid and TREE_CACHE_SECONDS > 0
+            else None
+        )
 
     def get_accessibility_tree(self, force_refresh: bool = False) -> dict:
-        """Get accessibility tree (cached for efficiency)."""
+        """
+        Get accessibility tree (cached for efficiency).
+
+        The in-memory copy serves repeat lookups within one process; a disk copy
+        younger than IOS_SIM_TREE_CACHE_MS serves back-to-back CLI invocations
+        (e.g. --list followed by --find-text --tap) without re-running idb.
+        """
         if self._tree_cache and not force_refresh:
             return self._tree_cache
 
+        if not force_refresh:
+            tree = self._load_disk_tree()
+            if tree:
+                self._tree_cache = tree
+                return tree
+
         # Delegate to shared utility
         self._tree_cache = get_accessibility_tree(self.udid, nested=True)
+        self._save_disk_tree(self._tree_cache)
         return self._tree_cache
 
-    def _flatten_tree(self, node: dict, elements: list[Element] | None = None) -> list[Element]:
-        """Flatten accessibility tree into list of elements."""
-        if elements is None:
-            elements = []
-
-        # Create element from node
-        if node.get("type"):
-            element = Element(
-                type=node.get("type", "Unknown"),
-                label=node.get("AXLabel"),
-                value=node.get("AXValue"),
-                identifier=node.get("AXUniqueId"),
-                frame=node.get("frame", {}),
-                traits=node.get("traits", []),
-                enabled=node.get("enabled", True),
-            )
-            elements.append(element)
-
-        # Process children
-        for child in node.get("children", []):
-            self._flatten_tree(child, elements)
+    def _load_disk_tree(self) -> dict | None:
+        """Load the disk-cached tree if it is younger than the TTL."""
+        if not self._disk_cache:
+            return None
+        try:
+            if time.time() - self._disk_cache.stat().st_mtime >= TREE_CACHE_SECONDS:
+                return None
+            return loads_json(self._disk_cache.read_bytes())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _save_disk_tree(self, tree: dict) -> None:
+        """Write the tree to the disk cache atomically (best effort)."""
+        if not self._disk_cache or not tree:
+            return
+        try:
+            self._disk_cache.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._disk_cache.with_suffix(".tmp")
+            tmp.write_bytes(dumps_json(tree))
+            tmp.replace(self._disk_cache)
+        except OSError:
+            pass
+
+    def _invalidate_disk_tree(self) -> None:
+        """Drop the disk-cached tree after an action that changes the UI."""
+        if self._disk_cache:
+            with contextlib.suppress(OSError):
+                self._disk_cache.unlink()
+
+    @staticmethod
+    def _element_from_node(node: dict) -> Element:
+        """Build an Element from a raw accessibility node."""
+        return Element(
+            type=node.get("type", "Unknown"),
+            label=node.get("AXLabel"),
+            value=node.get("AXValue"),
+            identifier=node.get("AXUniqueId"),
+            frame=node.get("frame", {}),
+            traits=node.get("traits", []),
+            enabled=node.get("enabled", True),
+        )
 
-        return elements
+    def get_index(self, force_refresh: bool = False) -> TreeIndex:
+        """Get the column index for the current tree (rebuilt when the tree changes)."""
+        tree = self.get_accessibility_tree(force_refresh)
+        if self._index is None or self._index_tree is not tree:
+            self._index = TreeIndex(tree)
+            self._index_tree = tree
+        return self._index
 
     def list_elements(self, force_refresh: bool = False) -> list[Element]:
         """Get flat list of all UI elements on current screen."""
-        tree = self.get_accessibility_tree(force_refresh)
-        return self._flatten_tree(tree)
+        index = self.get_index(force_refresh)
+        return [self._element_from_node(node) for node in index.nodes]
 
     def find_element(
         self,
@@ -166,39 +316,63 @@ class Navigator:
         Returns:
             Element if found, None otherwise
         """
-        tree = self.get_accessibility_tree()
-        elements = self._flatten_tree(tree)
-
-        matches = []
-
-        for elem in elements:
+        tree_index = self.get_index()
+
+        # Narrow to the smallest candidate row list the id/text/type maps offer;
+        # every criterion whose map wasn't picked is still checked per row
+        keyed = []
+        if identifier:
+            keyed.append(("id", tree_index.by_id.get(identifier, [])))
+        if text and not fuzzy:
+            keyed.append(("text", tree_index.by_text.get(text, [])))
+        if element_type:
+            keyed.append(("type", tree_index.by_type.get(element_type, [])))
+        narrowed_by, candidates = (
+            min(keyed, key=lambda entry: len(entry[1])) if keyed else (None, range(len(tree_index)))
+        )
+        check_id = identifier and narrowed_by != "id"
+        check_type = element_type and narrowed_by != "type"
+        check_text = text and narrowed_by != "text"
+
+        types = tree_index.types
+        labels = tree_index.labels
+        values = tree_index.values
+        identifiers = tree_index.identifiers
+        texts_lc = tree_index.texts_lc
+        enabled = tree_index.enabled
+        needle = text.lower() if text and fuzzy else text
+
+        def matches(i: int) -> bool:
             # Skip disabled elements
-            if not elem.enabled:
-                continue
+            if not enabled[i]:
+                return False
 
-            # Check type
-            if element_type and elem.type != element_type:
-                continue
+            # Check identifier
+            if check_id and identifiers[i] != identifier:
+                return False
 
-            # Check identifier (exact match)
-            if identifier and elem.identifier != identifier:
-                continue
+            # Check type
+            if check_type and types[i] != element_type:
+                return False
 
             # Check text (in label or value)
-            if text:
-                elem_text = (elem.label or "") + " " + (elem.value or "")
+            if check_text:
                 if fuzzy:
-                    if text.lower() not in elem_text.lower():
-                        continue
-                elif text not in (elem.label, elem.value):
-                    continue
+                    if needle not in texts_lc[i]:
+                        return False
+                elif text not in (labels[i], values[i]):
+                    return False
 
-            matches.append(elem)
-
-        if matches and index < len(matches):
-            return matches[index]
+            return True
 
-        return None
+        # Stop at the index-th match; only that row becomes an Element
+        hits = filter(matches, candidates)
+        if index < 0:
+            found = list(hits)
+            row = found[index] if -index <= len(found) else None
+        else:
+            row = next(islice(hits, index, None), None)
+        return self._element_from_node(tree_index.nodes[row]) if row is not None else None
 
     def tap(self, element: Element) -> bool:
         """Tap on an element."""
@@ -211,6 +385,7 @@ class Navigator:
         if self.udid:
             cmd.extend(["--udid", self.udid])
 
+        self._invalidate_disk_tree()
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             return True
@@ -232,22 +407,78 @@ class Navigator:
         if element:
             if not self.tap(element):
                 return False
-            # Small delay for focus
-            import time
-
-            time.sleep(TAP_SETTLE_SECONDS)
+            # Wait (bounded) for the tapped field to take focus
+            self._wait_for_focus(element)
 
         # Enter text
         cmd = ["idb", "ui", "text", text]
         if self.udid:
             cmd.extend(["--udid", self.udid])
 
+        self._invalidate_disk_tree()
         try:
             subprocess.run(cmd, capture_output=True, check=True)
             return True
         except subprocess.CalledProcessError:
             return False
 
+    def _wait_for_focus(self, element: Element) -> bool:
+        """
+        Poll the accessibility tree until the tapped element reports focus.
+
+        Returns as soon as that element is focused instead of always sleeping
+        the full settle time; focus elsewhere (the previous field) doesn't
+        count. Bounded by IOS_SIM_TAP_SETTLE_MS. If the tree can't be fetched,
+        or no node carries a focus key at all, sleeps out the remainder as
+        before.
+
+        Args:
+            element: Element that was just tapped
+
+        Returns:
+            True if focus on element was observed before the deadline
+        """
+        deadline = time.monotonic() + TAP_SETTLE_SECONDS
+        cmd = ["idb", "ui", "describe-all", "--json"]
+        if self.udid:
+            cmd.extend(["--udid", self.udid])
+
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                result = subprocess.run(cmd, capture_output=True, check=True, timeout=remaining)
+                nodes = loads_json(result.stdout)
+            except (subprocess.SubprocessError, OSError, json.JSONDecodeError):
+                time.sleep(max(0.0, deadline - time.monotonic()))
+                return False
+
+            reported = False
+            for node in nodes if isinstance(nodes, list) else ():
+                if not isinstance(node, dict):
+                    continue
+                keys = [key for key in _FOCUS_KEYS if key in node]
+                if not keys:
+                    continue
+                reported = True
+                if any(node[key] for key in keys) and self._is_same_element(node, element):
+                    return True
+
+            if not reported:
+                # This idb doesn't report focus, so polling can't tell; settle
+                time.sleep(max(0.0, deadline - time.monotonic()))
+                return False
+
+            time.sleep(max(0.0, min(FOCUS_POLL_SECONDS, deadline - time.monotonic())))
+
+        return False
+
+    @staticmethod
+    def _is_same_element(node: dict, element: Element) -> bool:
+        """Match a raw tree node to an Element by identifier, else by frame."""
+        identifier = node.get("AXUniqueId")
+        if identifier and element.identifier:
+            return identifier == element.identifier
+        return node.get("frame") == element.frame
+
     def find_and_tap(
         self,
         text: str | None = None,
@@ -300,6 +531,80 @@ class Navigator:
             return (True, f"Entered text in: {element.description}")
         return (False, "Failed to enter text")
 
+    def run_batch(self, ops: list[dict]) -> list[dict]:
+        """
+        Execute a sequence of operations in one process.
+
+        Ops share the cached accessibility tree; set "refresh": true on an op
+        to re-fetch before it runs (e.g. after a tap navigates). Execution
+        stops at the first failing op.
+
+        Supported ops (keys mirror the CLI flags):
+            {"op": "find" | "tap", "find_text"|"find_exact"|"find_type"|"find_id", "index"}
+            {"op": "enter_text", "text", [find criteria; find_type defaults to TextField]}
+            {"op": "tap_at", "x", "y"}
+
+        Args:
+            ops: Operation dicts
+
+        Returns:
+            One {"op", "success", "message"} dict per executed op
+        """
+        results = []
+        for op in ops:
+            success, message = self._run_batch_op(op)
+            results.append({"op": op.get("op"), "success": success, "message": message})
+            if not success:
+                break
+        return results
+
+    def _run_batch_op(self, op: dict) -> tuple[bool, str]:
+        """Execute a single batch operation."""
+        kind = op.get("op")
+        if op.get("refresh"):
+            self.get_accessibility_tree(force_refresh=True)
+
+        if kind == "tap_at":
+            try:
+                x, y = int(op["x"]), int(op["y"])
+            except (KeyError, TypeError, ValueError):
+                return (False, "tap_at requires integer x and y")
+            if self.tap_at(x, y):
+                return (True, f"Tapped at ({x}, {y})")
+            return (False, f"Failed to tap at ({x}, {y})")
+
+        if kind not in ("find", "tap", "enter_text"):
+            return (False, f"Unknown op: {kind!r}")
+
+        index = op.get("index", 0)
+        # JSON may carry "1", 1.5 or true here; bool is an int subclass
+        if not isinstance(index, int) or isinstance(index, bool):
+            return (False, "index must be an integer")
+
+        default_type = "TextField" if kind == "enter_text" else None
+        element = self.find_element(
+            text=op.get("find_text") or op.get("find_exact"),
+            element_type=op.get("find_type", default_type),
+            identifier=op.get("find_id"),
+            index=index,
+            fuzzy=op.get("find_exact") is None,
+        )
+        if not element:
+            return (False, "Element not found")
+
+        if kind == "find":
+            return (True, f"Found: {element.description} at {element.center}")
+        if kind == "tap":
+            if self.tap(element):
+                return (True, f"Tapped: {element.description} at {element.center}")
+            return (False, f"Failed to tap: {element.description}")
+
+        if "text" not in op:
+            return (False, "enter_text requires text")
+        if self.enter_text(str(op["text"]), element):
+            return (True, f"Entered text in: {element.description}")
+        return (False, "Failed to enter text")
+
 
 def main():
     """Main entry point."""
@@ -340,6 +645,16 @@ def main():
         help="Device UDID (auto-detects booted simulator if not provided)",
     )
     parser.add_argument("--list", action="store_true", help="List all tappable elements")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Run a JSON list of operations from FILE ('-' for stdin); prints JSON results",
+    )
+    parser.add_argument(
+        "--no-tree-cache",
+        action="store_true",
+        help="Always fetch a fresh accessibility tree (skip the short-lived disk cache)",
+    )
 
     args = parser.parse_args()
 
@@ -350,7 +665,26 @@ def main():
         print(f"Error: {e}")
         sys.exit(1)
 
-    navigator = Navigator(udid=udid)
+    navigator = Navigator(udid=udid, tree_cache=not args.no_tree_cache)
+
+    # Batch mode
+    if args.batch:
+        try:
+            if args.batch == "-":
+                ops = json.load(sys.stdin)
+            else:
+                with open(args.batch) as f:
+                    ops = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: Could not read batch: {e}")
+            sys.exit(1)
+        if not isinstance(ops, list) or not all(isinstance(op, dict) for op in ops):
+            print("Error: --batch expects a JSON list of operation objects")
+            sys.exit(1)
+
+        results = navigator.run_batch(ops)
+        print(json.dumps(results, indent=2))
+        sys.exit(0 if len(results) == len(ops) and all(r["success"] for r in results) else 1)
 
     # List mode
     if args.list:
@@ -162,7 +162,7 @@ class ScreenMapper:
                     analysis["navigation"]["nav_title"] = label or "Navigation"
                 elif elem_type == "TabBar":
                     # Count tab items
-                    tab_count = len(node.get("children", []))
+                    tab_count = len(node.get("children") or ())
                     analysis["navigation"]["tab_count"] = tab_count
 
             # Track focusable elements
@@ -175,7 +175,7 @@ class ScreenMapper:
                 analysis["screen_name"] = identifier
 
         # Process children
-        for child in node.get("children", []):
+        for child in node.get("children") or ():
             self._analyze_recursive(child, analysis, depth + 1)
 
     def format_summary(self, analysis: dict, verbose: bool = False) -> str:
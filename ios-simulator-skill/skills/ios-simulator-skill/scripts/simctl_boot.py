@@ -19,7 +19,8 @@ import sys
 import time
 
 from common.device_utils import (
-    get_booted_device_udid,
+    invalidate_booted_cache,
+    is_device_booted,
     list_simulators,
     resolve_device_identifier,
 )
@@ -56,13 +57,9 @@ class SimulatorBooter:
         start_time = time.time()
 
         # Check if already booted
-        try:
-            booted = get_booted_device_udid()
-            if booted == self.udid:
-                elapsed = time.time() - start_time
-                return True, (f"Device already booted: {self.udid} " f"[checked in {elapsed:.1f}s]")
-        except RuntimeError:
-            pass  # No booted device, proceed with boot
+        if is_device_booted(self.udid):
+            elapsed = time.time() - start_time
+            return True, (f"Device already booted: {self.udid} " f"[checked in {elapsed:.1f}s]")
 
         # Execute boot command
         try:
@@ -83,6 +80,9 @@ class SimulatorBooter:
         except Exception as e:
             return False, f"Boot error: {e}"
 
+        # Any cached booted-device listing is now out of date
+        invalidate_booted_cache()
+
         # Optionally wait for readiness
         if wait_ready:
             ready, wait_message = self._wait_for_ready(timeout_seconds)
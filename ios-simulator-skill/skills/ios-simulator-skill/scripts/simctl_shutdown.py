@@ -19,6 +19,7 @@ import time
 from typing import Optional
 
 from common.device_utils import (
+    invalidate_booted_cache,
     list_simulators,
     resolve_device_identifier,
 )
@@ -66,6 +67,9 @@ class SimulatorShutdown:
         except Exception as e:
             return False, f"Shutdown error: {e}"
 
+        # Any cached booted-device listing is now out of date
+        invalidate_booted_cache()
+
         # Optionally verify shutdown
         if verify:
             ready, verify_message = self._verify_shutdown(timeout_seconds)
@@ -31,6 +31,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from common.device_utils import invalidate_booted_cache
+
 # Try to import config from build_and_test if available
 try:
     from xcode.config import Config
@@ -253,6 +255,7 @@ class SimulatorSelector:
                 capture_output=True,
                 check=True,
             )
+            invalidate_booted_cache()
             return True
         except subprocess.CalledProcessError as e:
             print(f"Error booting simulator: {e.stderr}", file=sys.stderr)
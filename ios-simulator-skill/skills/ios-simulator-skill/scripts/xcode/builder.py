@@ -4,9 +4,17 @@ Xcode build execution.
 Handles xcodebuild command construction and execution with xcresult generation.
 """
 
+import functools
+import hashlib
+import json
+import os
+import plistlib
 import re
 import subprocess
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from common.env_config import env_int
@@ -17,6 +25,121 @@ from .config import Config
 BUILD_TIMEOUT = env_int("IOS_SIM_BUILD_TIMEOUT", 1800)
 TEST_TIMEOUT = env_int("IOS_SIM_TEST_TIMEOUT", 2700)
 INTROSPECT_TIMEOUT = env_int("IOS_SIM_INTROSPECT_TIMEOUT", 60)
+STDERR_MAX_LINES = env_int("IOS_SIM_STDERR_MAX_LINES", 2000)
+# How long to keep draining stderr once xcodebuild has exited or been killed
+STDERR_DRAIN_SECONDS = 5
+
+# CoreSimulator rewrites device_set.plist (and the directory) when devices are
+# created, deleted or renamed, so their mtimes key the cached simulator list
+DEVICE_SET_DIR = Path("~/Library/Developer/CoreSimulator/Devices").expanduser()
+
+# Xcode's default DerivedData; each <Name>-<hash> dir records the container it
+# belongs to under WorkspacePath in its info.plist
+XCODE_DERIVED_DATA_DIR = Path("~/Library/Developer/Xcode/DerivedData").expanduser()
+
+# Every file under the project counts as a build input except these: build
+# products, VCS metadata, per-user Xcode state and this skill's own config
+# (.claude, rewritten after each build). A denylist, because any
+# resource (models, assets, fixtures, shaders, fonts) can change the product
+_SKIPPED_DIRS = frozenset(
+    {".git", ".hg", ".svn", ".build", ".claude", "DerivedData", "build", "xcuserdata"}
+)
+_SKIPPED_FILES = frozenset({".DS_Store"})
+# Local Swift packages referenced from a project or workspace, which may live
+# outside the project directory
+_LOCAL_PACKAGE_RE = re.compile(
+    r'isa = XCLocalSwiftPackageReference;\s*relativePath = "?([^";]+)"?;'
+)
+_WORKSPACE_REF_RE = re.compile(r'location\s*=\s*"(?:group|container):([^"]+)"')
+
+# -destination keys, compiled once rather than on every config update
+_DESTINATION_NAME_RE = re.compile(r"name=([^,]+)")
+_DESTINATION_ID_RE = re.compile(r"id=([^,]+)")
+
+
+@functools.lru_cache(maxsize=1)
+def _xcode_version() -> str:
+    """
+    Get the active Xcode version, queried once per process.
+
+    `xcodebuild -version` is slow and can misreport when run concurrently, so
+    the result is cached. Both lines (marketing version and build number) are
+    kept so betas of the same version fingerprint differently.
+
+    Returns:
+        Version text like "Xcode 15.4 / Build version 15F31d" ("" if unavailable)
+    """
+    try:
+        result = subprocess.run(
+            ["xcodebuild", "-version"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=INTROSPECT_TIMEOUT,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return " / ".join(result.stdout.split("\n")[:2]).strip(" /")
+
+
+def _run_xcodebuild(cmd: list[str], timeout: int) -> tuple[int, str]:
+    """
+    Run xcodebuild, streaming stderr into a bounded tail.
+
+    stdout is never consumed downstream (diagnostics come from the xcresult
+    bundle, with stderr as fallback), so it goes straight to /dev/null. A
+    reader thread drains stderr into a deque capped at IOS_SIM_STDERR_MAX_LINES,
+    so memory stays flat however chatty the build is. Only the tail survives:
+    xcodebuild's failure summary comes last, but early compile errors in a long
+    log are dropped, which is why the xcresult bundle is the primary source.
+
+    Build service children can inherit the pipe and outlive xcodebuild, so
+    the reader is only waited on for STDERR_DRAIN_SECONDS after exit; it
+    closes the pipe itself once they let go.
+
+    Args:
+        cmd: Full xcodebuild command
+        timeout: Seconds before the process is killed
+
+    Returns:
+        Tuple of (returncode, stderr tail)
+
+    Raises:
+        subprocess.TimeoutExpired: If the build exceeded ``timeout``
+    """
+    tail: deque[str] = deque(maxlen=STDERR_MAX_LINES)
+    lock = threading.Lock()
+
+    def _drain(stream) -> None:
+        try:
+            for line in stream:
+                with lock:
+                    tail.append(line)
+        finally:
+            stream.close()
+
+    # Not a `with` block: its exit closes stderr, which blocks while a
+    # lingering child keeps the reader inside a read
+    # errors="replace": compiler output can quote non-UTF-8 source bytes, and a
+    # decode error would kill the reader and leave the pipe undrained
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors="replace"
+    )
+    reader = threading.Thread(target=_drain, args=(proc.stderr,), daemon=True)
+    reader.start()
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        reader.join(timeout=STDERR_DRAIN_SECONDS)
+        with lock:
+            stderr = "".join(tail)
+        raise subprocess.TimeoutExpired(cmd, timeout, stderr=stderr) from None
+
+    reader.join(timeout=STDERR_DRAIN_SECONDS)
+    with lock:
+        return (returncode, "".join(tail))
 
 
 class BuildRunner:
@@ -26,6 +149,9 @@ class BuildRunner:
     Handles scheme auto-detection, command construction, and build/test execution.
     """
 
+    # Detected scheme per resolved container path: (scheme fingerprint, scheme)
+    _scheme_memo: dict[str, tuple[str, str]] = {}
+
     def __init__(
         self,
         project_path: str | None = None,
@@ -34,6 +160,12 @@ class BuildRunner:
         configuration: str = "Debug",
         simulator: str | None = None,
         cache: XCResultCache | None = None,
+        jobs: int | None = None,
+        parallelize: bool = True,
+        parallel_testing: bool | None = None,
+        test_workers: int | None = None,
+        sign: bool = False,
+        pin_derived_data: bool = False,
     ):
         """
         Initialize build runner.
@@ -45,6 +177,13 @@ class BuildRunner:
             configuration: Build configuration (Debug/Release)
             simulator: Simulator name
             cache: XCResult cache (creates default if not provided)
+            jobs: Concurrent build tasks for -jobs (default: CPU count)
+            parallelize: Build targets and compile tasks in parallel (-parallelizeTargets)
+            parallel_testing: Force parallel testing on/off (None defers to the scheme)
+            test_workers: Simulator clones for parallel testing (None lets Xcode decide)
+            sign: Keep code signing for simulator destinations (needed for some entitlements)
+            pin_derived_data: Build into a per-project DerivedData under the cache
+                instead of Xcode's default, which the Xcode IDE also uses
         """
         self.project_path = project_path
         self.workspace_path = workspace_path
@@ -52,45 +191,205 @@ class BuildRunner:
         self.configuration = configuration
         self.simulator = simulator
         self.cache = cache or XCResultCache()
+        self.jobs = jobs or os.cpu_count() or 4
+        self.parallelize = parallelize
+        self.parallel_testing = parallel_testing
+        self.test_workers = test_workers
+        self.sign = sign
+        self.pin_derived_data = pin_derived_data
+        # (simulator it was resolved for, destination)
+        self._destination: tuple[str | None, str] | None = None
 
     def auto_detect_scheme(self) -> str | None:
         """
         Auto-detect build scheme from project/workspace.
 
+        Scheme lists are cached on disk keyed by a fingerprint of the
+        container's scheme sources, so `xcodebuild -list` (a multi-second
+        process) only runs when the project actually changed. Hits are also
+        memoized per process for repeated build/test cycles.
+
         Returns:
             Detected scheme name or None
         """
-        cmd = ["xcodebuild", "-list"]
+        container = self.workspace_path or self.project_path
+        if not container:
+            return None
+
+        container_key = str(Path(container).resolve())
+        fingerprint = self._scheme_fingerprint(Path(container))
+
+        # In-process memo first: repeated build/test cycles skip the disk read too
+        memo = BuildRunner._scheme_memo.get(container_key)
+        if memo and memo[0] == fingerprint:
+            return memo[1]
+
+        schemes = self.cache.get_schemes(container_key, fingerprint)
+
+        if schemes is None:
+            schemes = self._list_schemes()
+            if schemes:
+                self.cache.save_schemes(container_key, fingerprint, schemes)
+
+        scheme = schemes[0] if schemes else None
+        if scheme:
+            BuildRunner._scheme_memo[container_key] = (fingerprint, scheme)
+        return scheme
+
+    def _scheme_fingerprint(self, container: Path) -> str:
+        """
+        Fingerprint the files that determine a container's scheme list.
+
+        Auto-generated schemes come from project.pbxproj / workspace contents;
+        shared and user schemes live in xcshareddata/xcuserdata, whose
+        directory mtimes change when scheme files are added or removed.
+
+        Args:
+            container: .xcodeproj or .xcworkspace path
+
+        Returns:
+            Hex digest over (relpath, mtime_ns, size) of each source present
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for rel in (
+            "project.pbxproj",
+            "contents.xcworkspacedata",
+            "xcshareddata/xcschemes",
+            "xcuserdata",
+        ):
+            try:
+                st = (container / rel).stat()
+            except OSError:
+                continue
+            digest.update(f"{rel}:{st.st_mtime_ns}:{st.st_size};".encode())
+        return digest.hexdigest()
+
+    def _source_fingerprint(self, destination: str, extra: str = "") -> str:
+        """
+        Fingerprint build inputs for the incremental-build gate.
+
+        Walks the project directory, and any local Swift packages it references
+        from outside it, hashing (path, mtime_ns, size) of every file, plus the
+        scheme, configuration, destination and Xcode version. Only VCS
+        metadata, build products (DerivedData, build, .build, *.xcresult) and
+        xcuserdata are skipped, so an edit to any resource invalidates.
+
+        Args:
+            destination: Resolved -destination string
+            extra: Action-specific options that also change the outcome
+
+        Returns:
+            Hex digest identifying this exact set of inputs
+        """
+        container = Path(self.workspace_path or self.project_path or ".").resolve()
+        root = container.parent
+
+        # The skill's own cache (results, DerivedData) may sit inside the project
+        cache_dir = str(self.cache.cache_dir.resolve())
+
+        entries = []
+        for walk_root in (root, *self._external_package_dirs(container, root)):
+            for dirpath, dirnames, filenames in os.walk(walk_root):
+                dirnames[:] = [
+                    d
+                    for d in dirnames
+                    if d not in _SKIPPED_DIRS
+                    and not d.endswith(".xcresult")
+                    and f"{dirpath}{os.sep}{d}" != cache_dir
+                ]
+                for name in filenames:
+                    if name in _SKIPPED_FILES:
+                        continue
+                    path = Path(dirpath) / name
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    entries.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            f"{_xcode_version()}|{self.scheme}|{self.configuration}|{destination}|{extra}\n".encode()
+        )
+        for entry in sorted(entries):
+            digest.update(entry.encode())
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    @staticmethod
+    def _external_package_dirs(container: Path, root: Path) -> list[Path]:
+        """
+        Find local Swift packages referenced from outside the project directory.
+
+        Local packages appear as XCLocalSwiftPackageReference entries in
+        project.pbxproj, or as group/container file refs in a workspace.
+
+        Args:
+            container: Resolved .xcodeproj or .xcworkspace path
+            root: Directory already covered by the fingerprint walk
+
+        Returns:
+            Existing package directories that are not inside root
+        """
+        refs: list[Path] = []
+        projects = [container] if container.suffix == ".xcodeproj" else []
+        workspace_data = container / "contents.xcworkspacedata"
+        if workspace_data.is_file():
+            try:
+                text = workspace_data.read_text(errors="replace")
+            except OSError:
+                text = ""
+            for location in _WORKSPACE_REF_RE.findall(text):
+                ref = (root / location).resolve()
+                if ref.suffix == ".xcodeproj":
+                    projects.append(ref)
+                else:
+                    refs.append(ref)
+
+        for project in projects:
+            try:
+                text = (project / "project.pbxproj").read_text(errors="replace")
+            except OSError:
+                continue
+            refs.extend((project.parent / rel).resolve() for rel in _LOCAL_PACKAGE_RE.findall(text))
+
+        external = []
+        for ref in refs:
+            if ref.is_dir() and not ref.is_relative_to(root) and ref not in external:
+                external.append(ref)
+        return external
+
+    def _list_schemes(self) -> list[str]:
+        """
+        List schemes via `xcodebuild -list -json`.
+
+        Returns:
+            Scheme names in xcodebuild's order (empty on error)
+        """
+        cmd = ["xcodebuild", "-list", "-json"]
 
         if self.workspace_path:
             cmd.extend(["-workspace", self.workspace_path])
         elif self.project_path:
             cmd.extend(["-project", self.project_path])
         else:
-            return None
+            return []
 
         try:
             result = subprocess.run(
                 cmd, capture_output=True, text=True, check=True, timeout=INTROSPECT_TIMEOUT
             )
-
-            # Parse schemes from output
-            in_schemes_section = False
-            for line in result.stdout.split("\n"):
-                line = line.strip()
-
-                if "Schemes:" in line:
-                    in_schemes_section = True
-                    continue
-
-                if in_schemes_section and line and not line.startswith("Build"):
-                    # First scheme in list
-                    return line
-
+            data = json.loads(result.stdout)
         except subprocess.CalledProcessError as e:
             print(f"Error auto-detecting scheme: {e}", file=sys.stderr)
+            return []
+        except json.JSONDecodeError as e:
+            print(f"Error parsing xcodebuild -list output: {e}", file=sys.stderr)
+            return []
 
-        return None
+        # Top-level key is "project" or "workspace" depending on the container
+        container = data.get("project") or data.get("workspace") or {}
+        return list(container.get("schemes", []))
 
     def get_simulator_destination(self) -> str:
         """
@@ -102,12 +401,21 @@ class BuildRunner:
             1. --simulator CLI flag (self.simulator)
             2. Config preferred_simulator
             3. Config last_used_simulator
-            4. Auto-detect first iPhone
+            4. Auto-detect first iPhone on the newest iOS runtime
             5. Generic iOS Simulator
 
+        Resolved once per runner (config read plus simctl lookups); changing
+        self.simulator re-resolves.
+
         Returns:
             Destination string for -destination flag
         """
+        if self._destination is None or self._destination[0] != self.simulator:
+            self._destination = (self.simulator, self._resolve_destination())
+        return self._destination[1]
+
+    def _resolve_destination(self) -> str:
+        """Resolve the destination string (see get_simulator_destination)."""
         # Priority 1: CLI flag
         if self.simulator:
             return f"platform=iOS Simulator,name={self.simulator}"
@@ -151,85 +459,320 @@ class BuildRunner:
         Returns:
             True if simulator exists and is available
         """
+        return any(device["name"] == name for device in self._available_simulators())
+
+    def _available_simulators(self) -> list[dict]:
+        """
+        List available iOS simulators, newest runtime first.
+
+        Parsed from `simctl list -j devices available` and cached on disk
+        keyed by the device set's mtimes, so repeat builds skip simctl.
+
+        Returns:
+            Dicts with name, udid, runtime (e.g. [18, 2]); empty on error
+        """
+        fingerprint = self._device_set_fingerprint()
+        if fingerprint:
+            cached = self.cache.get_simulators(fingerprint)
+            if cached is not None:
+                return cached
+
         try:
             result = subprocess.run(
-                ["xcrun", "simctl", "list", "devices", "available", "iOS"],
+                ["xcrun", "simctl", "list", "-j", "devices", "available"],
                 capture_output=True,
                 text=True,
                 check=True,
                 timeout=INTROSPECT_TIMEOUT,
             )
+            data = json.loads(result.stdout)
+        except (subprocess.SubprocessError, OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not list simulators: {e}", file=sys.stderr)
+            return []
+
+        devices = []
+        for runtime, entries in data.get("devices", {}).items():
+            # e.g. "com.apple.CoreSimulator.SimRuntime.iOS-18-2"
+            _, _, version = runtime.rpartition(".iOS-")
+            if not version:
+                continue
+            runtime_version = [int(part) for part in version.split("-") if part.isdigit()]
+            devices.extend(
+                {"name": entry["name"], "udid": entry["udid"], "runtime": runtime_version}
+                for entry in entries
+                if entry.get("isAvailable", True) and entry.get("name") and entry.get("udid")
+            )
 
-            # Check if simulator name appears in available devices
-            return any(name in line and "(" in line for line in result.stdout.split("\n"))
+        # Stable sort: newest runtime first, simctl's device order within a runtime
+        devices.sort(key=lambda device: device["runtime"], reverse=True)
 
-        except subprocess.CalledProcessError:
-            return False
+        if fingerprint:
+            self.cache.save_simulators(fingerprint, devices)
+        return devices
+
+    @staticmethod
+    def _device_set_fingerprint() -> str | None:
+        """Fingerprint the CoreSimulator device set (None if it can't be read)."""
+        try:
+            plist = (DEVICE_SET_DIR / "device_set.plist").stat()
+            devices_dir = DEVICE_SET_DIR.stat()
+        except OSError:
+            return None
+        return f"{plist.st_mtime_ns}:{plist.st_size}:{devices_dir.st_mtime_ns}"
 
     def _extract_simulator_name_from_destination(self, destination: str) -> str | None:
         """
         Extract simulator name from destination string.
 
         Args:
-            destination: Destination string (e.g., "platform=iOS Simulator,name=iPhone 16 Pro")
+            destination: Destination string (e.g., "platform=iOS Simulator,name=iPhone 16 Pro"
+                or "platform=iOS Simulator,id=<udid>")
 
         Returns:
             Simulator name or None
         """
         # Pattern: name=<simulator name>
-        match = re.search(r"name=([^,]+)", destination)
+        match = _DESTINATION_NAME_RE.search(destination)
         if match:
             return match.group(1).strip()
+
+        # Pattern: id=<udid> (auto-detected); map back through the device list
+        match = _DESTINATION_ID_RE.search(destination)
+        if match:
+            udid = match.group(1).strip()
+            for device in self._available_simulators():
+                if device["udid"] == udid:
+                    return device["name"]
         return None
 
     def _auto_detect_simulator(self) -> str:
         """
         Auto-detect best available iOS simulator.
 
+        Picks the first iPhone on the newest installed iOS runtime and targets
+        it by UDID, which is unambiguous when several runtimes share a name.
+
         Returns:
             Destination string for -destination flag
         """
-        try:
-            result = subprocess.run(
-                ["xcrun", "simctl", "list", "devices", "available", "iOS"],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=INTROSPECT_TIMEOUT,
-            )
+        for device in self._available_simulators():
+            if device["name"].startswith("iPhone"):
+                return f"platform=iOS Simulator,id={device['udid']}"
 
-            # Parse available simulators, prefer latest iPhone
-            # Looking for lines like: "iPhone 16 Pro (12345678-1234-1234-1234-123456789012) (Shutdown)"
-            for line in result.stdout.split("\n"):
-                if "iPhone" in line and "(" in line:
-                    # Extract device name
-                    name = line.split("(")[0].strip()
-                    if name:
-                        return f"platform=iOS Simulator,name={name}"
+        # Fallback to generic iOS Simulator if no iPhone found
+        return "generic/platform=iOS Simulator"
 
-            # Fallback to generic iOS Simulator if no iPhone found
-            return "generic/platform=iOS Simulator"
+    def _parallel_build_args(self) -> list[str]:
+        """
+        Compile-parallelism arguments shared by build and test.
 
-        except subprocess.CalledProcessError as e:
-            print(f"Warning: Could not auto-detect simulator: {e}", file=sys.stderr)
-            return "generic/platform=iOS Simulator"
+        -jobs caps concurrent build tasks; with parallelize on, targets build in
+        parallel and the IDEBuildOperationMaxNumberOfConcurrentCompileTasks
+        user default (passed xcodebuild's -default=value way) lets Swift
+        frontend jobs use the same budget instead of Xcode's lower default.
 
-    def build(self, clean: bool = False) -> tuple[bool, str, str]:
+        Returns:
+            Arguments to append to the xcodebuild command
+        """
+        args = ["-jobs", str(self.jobs)]
+        if self.parallelize:
+            args += [
+                "-parallelizeTargets",
+                f"-IDEBuildOperationMaxNumberOfConcurrentCompileTasks={self.jobs}",
+            ]
+        return args
+
+    def _simulator_build_args(self, destination: str) -> list[str]:
+        """
+        Arguments that skip signing and package checks for simulator builds.
+
+        Even without -allowProvisioningUpdates, xcodebuild gathers provisioning
+        inputs (network calls to Apple) unless signing is disabled, and
+        validates package plugins/macros and re-resolves packages on each run.
+        Simulators run unsigned code, and a committed Package.resolved already
+        pins dependencies, so these are skipped.
+
+        Args:
+            destination: Resolved -destination string
+
+        Returns:
+            Arguments to append to the xcodebuild command
+        """
+        if "iOS Simulator" not in destination:
+            return []
+
+        args = ["-skipPackagePluginValidation", "-skipMacroValidation"]
+        if not self.sign:
+            args += ["CODE_SIGNING_ALLOWED=NO", "CODE_SIGNING_REQUIRED=NO", "CODE_SIGN_IDENTITY="]
+
+        container = Path(self.workspace_path or self.project_path or ".")
+        resolved_paths = (
+            container / "xcshareddata/swiftpm/Package.resolved",
+            container / "project.xcworkspace/xcshareddata/swiftpm/Package.resolved",
+            container.parent / "Package.resolved",
+        )
+        if any(path.is_file() for path in resolved_paths):
+            args.append("-disableAutomaticPackageResolution")
+        return args
+
+    def _derived_data_args(self) -> list[str]:
+        """
+        -derivedDataPath arguments, when DerivedData pinning is enabled.
+
+        By default xcodebuild uses Xcode's shared DerivedData, so builds made
+        here and in the Xcode IDE reuse each other's incremental state. Pinning
+        gives the skill its own copy under the cache instead: stable across
+        runs even if the default location is cleaned or customised, at the
+        cost of a second full build and package checkout per project.
+        """
+        if not self.pin_derived_data:
+            return []
+        container = self.workspace_path or self.project_path
+        return ["-derivedDataPath", str(self.cache.derived_data_dir(container))]
+
+    def _resolve_scheme_and_destination(self) -> str:
+        """
+        Auto-detect the scheme (if unset) and resolve the simulator destination.
+
+        The two lookups are independent subprocess calls (`xcodebuild -list`,
+        `simctl list`), so they run concurrently when both are needed.
+
+        Returns:
+            Destination string; self.scheme is set, or left None if detection failed
+        """
+        if self.scheme:
+            return self.get_simulator_destination()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            scheme_future = pool.submit(self.auto_detect_scheme)
+            destination_future = pool.submit(self.get_simulator_destination)
+            self.scheme = scheme_future.result()
+            return destination_future.result()
+
+    def _reusable_result(
+        self, action: str, destination: str, clean: bool, force: bool, extra: str = ""
+    ) -> tuple[str | None, str | None, str | None]:
+        """
+        Check the incremental gate for an xcodebuild action.
+
+        Args:
+            action: "build" or "test"; each keeps its own last-success entry
+            destination: Resolved -destination string
+            clean: Clean runs always execute and are not recorded
+            force: Execute even on a fingerprint hit (the result is still recorded)
+            extra: Action-specific options folded into the fingerprint
+
+        Returns:
+            Tuple of (cache key, fingerprint, reusable xcresult_id); all None
+            when the gate does not apply
+        """
+        container = self.workspace_path or self.project_path
+        if not container or clean:
+            return (None, None, None)
+
+        container_key = str(Path(container).resolve())
+        if action != "build":
+            container_key = f"{container_key}#{action}"
+        fingerprint = self._source_fingerprint(destination, extra)
+        if force:
+            return (container_key, fingerprint, None)
+
+        # A build is only reusable while its products are still on disk as
+        # it left them (not cleaned, deleted or overwritten by another build)
+        product = None
+        if action == "build":
+            product = self._product_stamp()
+            if product is None:
+                return (container_key, fingerprint, None)
+        cached_id = self.cache.get_last_success(container_key, fingerprint, product)
+        return (container_key, fingerprint, cached_id)
+
+    def _products_dir(self) -> Path | None:
+        """
+        Locate Build/Products/<Configuration>-iphonesimulator for this container.
+
+        Looks in the pinned DerivedData when enabled, otherwise in the Xcode
+        default DerivedData dir whose info.plist names this container.
+
+        Returns:
+            Products directory, or None if it doesn't exist (never built,
+            cleaned, or DerivedData relocated)
+        """
+        container = self.workspace_path or self.project_path
+        if self.pin_derived_data:
+            roots = [self.cache.derived_data_dir(container)]
+        else:
+            resolved = Path(container).resolve()
+            roots = []
+            for root in XCODE_DERIVED_DATA_DIR.glob(f"{resolved.stem}-*"):
+                try:
+                    with (root / "info.plist").open("rb") as f:
+                        workspace = plistlib.load(f).get("WorkspacePath")
+                except (OSError, plistlib.InvalidFileException):
+                    continue
+                if workspace and Path(workspace).resolve() == resolved:
+                    roots.append(root)
+
+        for root in roots:
+            products = root / "Build" / "Products" / f"{self.configuration}-iphonesimulator"
+            if products.is_dir():
+                return products
+        return None
+
+    def _product_stamp(self) -> str | None:
+        """
+        Stamp the build products: path plus mtime_ns of each product, and of
+        each app bundle's Info.plist and executable.
+
+        Returns:
+            Stamp string, or None if there are no products to reuse
+        """
+        products = self._products_dir()
+        if products is None:
+            return None
+
+        entries = []
+        for path in sorted(products.iterdir()):
+            paths = [path]
+            if path.suffix == ".app":
+                paths += [path / "Info.plist", path / path.stem]
+            for item in paths:
+                try:
+                    entries.append(f"{item}:{item.stat().st_mtime_ns}")
+                except OSError:
+                    entries.append(f"{item}:missing")
+        return "\n".join(entries) if entries else None
+
+    def build(self, clean: bool = False, force: bool = False) -> tuple[bool, str, str]:
         """
         Build the project.
 
+        Skips xcodebuild entirely when the source fingerprint matches the last
+        successful build and its products are still in DerivedData as it left
+        them, returning that build's xcresult instead.
+
         Args:
-            clean: Perform clean build
+            clean: Perform clean build (always runs xcodebuild)
+            force: Run xcodebuild even if sources are unchanged
 
         Returns:
             Tuple of (success: bool, xcresult_id: str, stderr: str)
         """
-        # Auto-detect scheme if needed
+        destination = self._resolve_scheme_and_destination()
         if not self.scheme:
-            self.scheme = self.auto_detect_scheme()
-            if not self.scheme:
-                print("Error: Could not auto-detect scheme. Use --scheme", file=sys.stderr)
-                return (False, "", "")
+            print("Error: Could not auto-detect scheme. Use --scheme", file=sys.stderr)
+            return (False, "", "")
+
+        # Incremental gate: unchanged inputs since the last success -> reuse its xcresult
+        container_key, fingerprint, cached_id = self._reusable_result(
+            "build", destination, clean, force
+        )
+        if cached_id:
+            print(
+                f"Sources unchanged since last successful build; reusing {cached_id}",
+                file=sys.stderr,
+            )
+            return (True, cached_id, "")
 
         # Generate xcresult ID and path
         xcresult_id = self.cache.generate_id()
@@ -251,6 +794,8 @@ class BuildRunner:
             print("Error: No project or workspace specified", file=sys.stderr)
             return (False, "", "")
 
+        cmd.extend(self._derived_data_args())
+
         cmd.extend(
             [
                 "-scheme",
@@ -258,28 +803,29 @@ class BuildRunner:
                 "-configuration",
                 self.configuration,
                 "-destination",
-                self.get_simulator_destination(),
+                destination,
                 "-resultBundlePath",
                 str(xcresult_path),
             ]
         )
 
+        cmd.extend(self._parallel_build_args())
+        cmd.extend(self._simulator_build_args(destination))
+
         # Execute build
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=False,  # Don't raise on non-zero exit
-                timeout=BUILD_TIMEOUT,
-            )
-
-            success = result.returncode == 0
+            returncode, stderr = _run_xcodebuild(cmd, BUILD_TIMEOUT)
+            success = returncode == 0
 
             # xcresult bundle should be created even on failure
             if not xcresult_path.exists():
                 print("Warning: xcresult bundle was not created", file=sys.stderr)
-                return (success, "", result.stderr)
+                return (success, "", stderr)
+
+            if success and fingerprint:
+                self.cache.save_last_success(
+                    container_key, fingerprint, xcresult_id, self._product_stamp()
+                )
 
             # Auto-update config with last used simulator (on success only)
             if success:
@@ -292,7 +838,6 @@ class BuildRunner:
                         project_dir = Path(self.workspace_path).parent
 
                     config = Config.load(project_dir=project_dir)
-                    destination = self.get_simulator_destination()
                     simulator_name = self._extract_simulator_name_from_destination(destination)
 
                     if simulator_name:
@@ -303,35 +848,66 @@ class BuildRunner:
                     # Don't fail build if config update fails
                     print(f"Warning: Could not update config: {e}", file=sys.stderr)
 
-            return (success, xcresult_id, result.stderr)
+            return (success, xcresult_id, stderr)
 
         except Exception as e:
             print(f"Error executing build: {e}", file=sys.stderr)
             return (False, "", str(e))
 
-    def test(self, test_suite: str | None = None) -> tuple[bool, str, str]:
+    def test(
+        self,
+        test_suite: str | None = None,
+        clean: bool = False,
+        force: bool = False,
+        reuse: bool = False,
+    ) -> tuple[bool, str, str]:
         """
         Run tests.
 
+        `xcodebuild test` builds whatever is out of date itself, so there is no
+        separate build step; build errors and test results land in the same
+        xcresult bundle. With reuse, a passing run with identical inputs and
+        test options is returned instead of running the suite again; that is
+        opt-in because a stale "tests passed" is worse than a slow run.
+
         Args:
             test_suite: Specific test suite to run
+            clean: Clean before building, in the same xcodebuild invocation
+            force: Run tests even if sources are unchanged
+            reuse: Return the last passing run when the fingerprint matches
 
         Returns:
             Tuple of (success: bool, xcresult_id: str, stderr: str)
         """
-        # Auto-detect scheme if needed
+        destination = self._resolve_scheme_and_destination()
         if not self.scheme:
-            self.scheme = self.auto_detect_scheme()
-            if not self.scheme:
-                print("Error: Could not auto-detect scheme. Use --scheme", file=sys.stderr)
-                return (False, "", "")
+            print("Error: Could not auto-detect scheme. Use --scheme", file=sys.stderr)
+            return (False, "", "")
+
+        # Incremental gate (opt-in): same sources and test options as the last
+        # passing run. Passing runs are recorded either way.
+        options = f"{test_suite}|{self.parallel_testing}|{self.test_workers}"
+        container_key, fingerprint, cached_id = self._reusable_result(
+            "test", destination, clean, force or not reuse, options
+        )
+        if cached_id:
+            print(
+                f"Sources unchanged since last passing test run; reusing {cached_id}",
+                file=sys.stderr,
+            )
+            return (True, cached_id, "")
 
         # Generate xcresult ID and path
         xcresult_id = self.cache.generate_id()
         xcresult_path = self.cache.get_path(xcresult_id)
 
         # Build command
-        cmd = ["xcodebuild", "-quiet", "test"]
+        cmd = ["xcodebuild", "-quiet"]  # Suppress verbose output
+
+        if clean:
+            cmd.append("clean")
+
+        cmd.append("test")
 
         if self.workspace_path:
             cmd.extend(["-workspace", self.workspace_path])
@@ -341,32 +917,44 @@ class BuildRunner:
             print("Error: No project or workspace specified", file=sys.stderr)
             return (False, "", "")
 
+        cmd.extend(self._derived_data_args())
+
         cmd.extend(
             [
                 "-scheme",
                 self.scheme,
                 "-destination",
-                self.get_simulator_destination(),
+                destination,
                 "-resultBundlePath",
                 str(xcresult_path),
             ]
         )
 
+        cmd.extend(self._parallel_build_args())
+        cmd.extend(self._simulator_build_args(destination))
+
         if test_suite:
             cmd.extend(["-only-testing", test_suite])
 
+        # Parallel testing clones the simulator per worker; for small unit suites the
+        # clone boot can outweigh the gain, so only override the scheme when asked.
+        if self.parallel_testing is not None:
+            cmd.extend(["-parallel-testing-enabled", "YES" if self.parallel_testing else "NO"])
+        if self.test_workers and self.parallel_testing is not False:
+            cmd.extend(["-parallel-testing-worker-count", str(self.test_workers)])
+
         # Execute tests
         try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, check=False, timeout=TEST_TIMEOUT
-            )
-
-            success = result.returncode == 0
+            returncode, stderr = _run_xcodebuild(cmd, TEST_TIMEOUT)
+            success = returncode == 0
 
             # xcresult bundle should be created even on failure
             if not xcresult_path.exists():
                 print("Warning: xcresult bundle was not created", file=sys.stderr)
-                return (success, "", result.stderr)
+                return (success, "", stderr)
+
+            if success and fingerprint:
+                self.cache.save_last_success(container_key, fingerprint, xcresult_id)
 
             # Auto-update config with last used simulator (on success only)
             if success:
@@ -379,7 +967,6 @@ class BuildRunner:
                         project_dir = Path(self.workspace_path).parent
 
                     config = Config.load(project_dir=project_dir)
-                    destination = self.get_simulator_destination()
                     simulator_name = self._extract_simulator_name_from_destination(destination)
 
                     if simulator_name:
@@ -390,7 +977,7 @@ class BuildRunner:
                     # Don't fail test if config update fails
                     print(f"Warning: Could not update config: {e}", file=sys.stderr)
 
-            return (success, xcresult_id, result.stderr)
+            return (success, xcresult_id, stderr)
 
         except Exception as e:
             print(f"Error executing tests: {e}", file=sys.stderr)
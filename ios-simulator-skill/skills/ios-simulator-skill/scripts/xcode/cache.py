@@ -4,6 +4,10 @@ XCResult cache management.
 Handles storage, retrieval, and lifecycle of xcresult bundles for progressive disclosure.
 """
 
+from __future__ import annotations
+
+import hashlib
+import json
 import shutil
 from datetime import datetime
 from pathlib import Path
@@ -20,6 +24,14 @@ class XCResultCache:
     # Default cache directory
     DEFAULT_CACHE_DIR = Path.home() / ".ios-simulator-skill" / "xcresults"
 
+    # Index files, one entry per project/workspace keyed by container path
+    SCHEMES_FILE = "schemes.json"
+    BUILDS_FILE = "builds.json"
+    SIMULATORS_FILE = "simulators.json"
+
+    # Per-project DerivedData roots live here, outside the xcresult namespace
+    DERIVED_DATA_DIR = "DerivedData"
+
     def __init__(self, cache_dir: Path | None = None):
         """
         Initialize cache manager.
@@ -152,6 +164,10 @@ class XCResultCache:
         removed = 0
         for bundle_path in all_bundles[keep_recent:]:
             shutil.rmtree(bundle_path)
+            # Drop per-bundle sidecars (stderr, test summary, query outputs) with it
+            for suffix in (".stderr", ".tests.json"):
+                bundle_path.with_name(bundle_path.stem + suffix).unlink(missing_ok=True)
+            shutil.rmtree(self._query_dir(bundle_path.stem), ignore_errors=True)
             removed += 1
 
         return removed
@@ -198,7 +214,262 @@ class XCResultCache:
             stderr content or empty string if not found
         """
         stderr_path = self.cache_dir / f"{xcresult_id}.stderr"
-        if not stderr_path.exists():
+        try:
+            return stderr_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
             return ""
 
-        return stderr_path.read_text(encoding="utf-8")
+    def bundle_fingerprint(self, xcresult_id: str) -> str | None:
+        """
+        Fingerprint an xcresult bundle by its Info.plist.
+
+        xcodebuild rewrites Info.plist whenever it (re)writes the bundle, so its
+        mtime and size identify the bundle contents without hashing them.
+
+        Args:
+            xcresult_id: XCResult ID
+
+        Returns:
+            "mtime_ns:size" string, or None if the bundle is missing
+        """
+        try:
+            st = (self.get_path(xcresult_id) / "Info.plist").stat()
+        except OSError:
+            return None
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    def get_test_summary(self, xcresult_id: str) -> dict | None:
+        """
+        Retrieve the cached test summary for a bundle.
+
+        Args:
+            xcresult_id: XCResult ID
+
+        Returns:
+            Dict with "summary" and "failed_tests", or None on miss or stale bundle
+        """
+        fingerprint = self.bundle_fingerprint(xcresult_id)
+        if fingerprint is None:
+            return None
+        try:
+            entry = json.loads(
+                (self.cache_dir / f"{xcresult_id}.tests.json").read_text(encoding="utf-8")
+            )
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return None
+        return {"summary": entry.get("summary"), "failed_tests": entry.get("failed_tests")}
+
+    def save_test_summary(
+        self, xcresult_id: str, summary: dict | None, failed_tests: list[dict] | None
+    ) -> None:
+        """
+        Cache the extracted test summary alongside the bundle.
+
+        Args:
+            xcresult_id: XCResult ID
+            summary: Normalized counts from XCResultParser.get_test_summary()
+            failed_tests: Failed test details from XCResultParser.get_failed_tests()
+        """
+        fingerprint = self.bundle_fingerprint(xcresult_id)
+        if fingerprint is None:
+            return
+        entry = {"fingerprint": fingerprint, "summary": summary, "failed_tests": failed_tests}
+        path = self.cache_dir / f"{xcresult_id}.tests.json"
+        temp_path = path.with_suffix(".tmp")
+        try:
+            temp_path.write_text(json.dumps(entry), encoding="utf-8")
+            temp_path.replace(path)
+        except OSError:
+            pass
+
+    def get_query(self, xcresult_id: str, args: list[str]) -> bytes | None:
+        """
+        Retrieve cached xcresulttool output for a bundle.
+
+        Args:
+            xcresult_id: XCResult ID
+            args: xcresulttool arguments the output was produced with
+
+        Returns:
+            Raw stdout, or None on miss or stale bundle
+        """
+        key = self._query_key(xcresult_id, args)
+        if key is None:
+            return None
+        try:
+            return (self._query_dir(xcresult_id) / key).read_bytes()
+        except OSError:
+            return None
+
+    def save_query(self, xcresult_id: str, args: list[str], output: bytes) -> None:
+        """
+        Cache xcresulttool output so later invocations skip the export.
+
+        Args:
+            xcresult_id: XCResult ID
+            args: xcresulttool arguments the output was produced with
+            output: Raw stdout
+        """
+        key = self._query_key(xcresult_id, args)
+        if key is None:
+            return
+        path = self._query_dir(xcresult_id) / key
+        temp_path = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(exist_ok=True)
+            temp_path.write_bytes(output)
+            temp_path.replace(path)
+        except OSError:
+            pass
+
+    def _query_dir(self, xcresult_id: str) -> Path:
+        """Sidecar directory holding cached xcresulttool outputs for a bundle."""
+        return self.cache_dir / f"{xcresult_id}.queries"
+
+    def _query_key(self, xcresult_id: str, args: list[str]) -> str | None:
+        """File name for a query, keyed by bundle fingerprint (None if bundle missing)."""
+        fingerprint = self.bundle_fingerprint(xcresult_id)
+        if fingerprint is None:
+            return None
+        raw = "\0".join([fingerprint, *args])
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def get_schemes(self, container: str, fingerprint: str) -> list[str] | None:
+        """
+        Retrieve cached scheme list for a project/workspace.
+
+        Args:
+            container: Resolved .xcodeproj/.xcworkspace path
+            fingerprint: Current fingerprint of the container's scheme sources
+
+        Returns:
+            Cached scheme names, or None on miss or stale fingerprint
+        """
+        entry = self._load_json(self.SCHEMES_FILE).get(container)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        return entry.get("schemes")
+
+    def save_schemes(self, container: str, fingerprint: str, schemes: list[str]) -> None:
+        """
+        Cache scheme list for a project/workspace.
+
+        One entry is kept per container, so the file stays bounded by the
+        number of projects built rather than the number of edits.
+
+        Args:
+            container: Resolved .xcodeproj/.xcworkspace path
+            fingerprint: Fingerprint of the container's scheme sources
+            schemes: Scheme names reported by xcodebuild
+        """
+        data = self._load_json(self.SCHEMES_FILE)
+        data[container] = {"fingerprint": fingerprint, "schemes": schemes}
+        self._save_json(self.SCHEMES_FILE, data)
+
+    def get_last_success(
+        self, container: str, fingerprint: str, product: str | None = None
+    ) -> str | None:
+        """
+        Look up the xcresult of the last successful build with identical inputs.
+
+        Args:
+            container: Resolved .xcodeproj/.xcworkspace path
+            fingerprint: Fingerprint of the build inputs
+            product: Stamp of the build products as they are now
+
+        Returns:
+            xcresult ID if the fingerprint and product stamp match and the
+            bundle still exists
+        """
+        entry = self._load_json(self.BUILDS_FILE).get(container)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        if entry.get("product") != product:
+            return None
+        xcresult_id = entry.get("xcresult_id")
+        return xcresult_id if xcresult_id and self.exists(xcresult_id) else None
+
+    def save_last_success(
+        self, container: str, fingerprint: str, xcresult_id: str, product: str | None = None
+    ) -> None:
+        """
+        Record a successful build so identical inputs can reuse its xcresult.
+
+        Args:
+            container: Resolved .xcodeproj/.xcworkspace path
+            fingerprint: Fingerprint of the build inputs
+            xcresult_id: XCResult ID produced by the build
+            product: Stamp of the build products it left behind
+        """
+        data = self._load_json(self.BUILDS_FILE)
+        data[container] = {
+            "fingerprint": fingerprint,
+            "xcresult_id": xcresult_id,
+            "product": product,
+        }
+        self._save_json(self.BUILDS_FILE, data)
+
+    def derived_data_dir(self, container: str) -> Path:
+        """
+        Get the persistent DerivedData directory for a project/workspace.
+
+        Keyed by the resolved container path so every run for the same
+        checkout reuses the same incremental build state.
+
+        Args:
+            container: Path to the .xcodeproj/.xcworkspace
+
+        Returns:
+            Existing directory to pass as -derivedDataPath
+        """
+        key = str(Path(container).resolve())
+        digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        path = self.cache_dir / self.DERIVED_DATA_DIR / f"{Path(container).stem}-{digest}"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def get_simulators(self, fingerprint: str) -> list[dict] | None:
+        """
+        Retrieve the cached list of available simulators.
+
+        Args:
+            fingerprint: Current fingerprint of the CoreSimulator device set
+
+        Returns:
+            Device dicts (name, udid, runtime), or None on miss or stale fingerprint
+        """
+        data = self._load_json(self.SIMULATORS_FILE)
+        if data.get("fingerprint") != fingerprint:
+            return None
+        return data.get("devices")
+
+    def save_simulators(self, fingerprint: str, devices: list[dict]) -> None:
+        """
+        Cache the list of available simulators.
+
+        Args:
+            fingerprint: Fingerprint of the CoreSimulator device set
+            devices: Device dicts (name, udid, runtime)
+        """
+        self._save_json(self.SIMULATORS_FILE, {"fingerprint": fingerprint, "devices": devices})
+
+    def _load_json(self, name: str) -> dict:
+        """Load a cache index file, treating a missing or corrupt file as empty."""
+        try:
+            data = json.loads((self.cache_dir / name).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_json(self, name: str, data: dict) -> None:
+        """Atomically write a cache index file (temp file + rename)."""
+        path = self.cache_dir / name
+        temp_path = path.with_suffix(".tmp")
+        try:
+            temp_path.write_text(json.dumps(data), encoding="utf-8")
+            temp_path.replace(path)
+        except OSError:
+            # Index files are an optimisation; a failed write just means a miss next time
+            pass
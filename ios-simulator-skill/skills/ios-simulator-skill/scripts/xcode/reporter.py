@@ -50,25 +50,26 @@ class OutputFormatter:
         Returns:
             Minimal formatted string
         """
-        lines = []
-
         if test_info:
             # Test mode
-            total = test_info.get("total", 0)
-            passed = test_info.get("passed", 0)
-            failed = test_info.get("failed", 0)
-            duration = test_info.get("duration", 0.0)
-
-            test_status = "PASS" if failed == 0 else "FAIL"
-            lines.append(
-                f"Tests: {test_status} ({passed}/{total} passed, {duration:.1f}s) [{xcresult_id}]"
+            get = test_info.get
+            test_status = "PASS" if get("failed", 0) == 0 else "FAIL"
+            header = (
+                f"Tests: {test_status} ({get('passed', 0)}/{get('total', 0)} passed, "
+                f"{get('duration', 0.0):.1f}s) [{xcresult_id}]"
             )
         else:
             # Build mode
-            lines.append(
+            header = (
                 f"Build: {status} ({error_count} errors, {warning_count} warnings) [{xcresult_id}]"
             )
 
+        # Common case (success): the one-line header is the whole output
+        if not failed_tests and status != "FAILED":
+            return header
+
+        lines = [header]
+
         # Surface errors inline on failure
         if status == "FAILED" and errors:
             lines.append("")
@@ -131,34 +132,7 @@ class OutputFormatter:
         Returns:
             Formatted error list
         """
-        if not errors:
-            return "No errors found."
-
-        lines = [f"Errors ({len(errors)}):"]
-        lines.append("")
-
-        for i, error in enumerate(errors[:limit], 1):
-            message = error.get("message", "Unknown error")
-            location = error.get("location", {})
-
-            # Format location
-            loc_parts = []
-            if location.get("file"):
-                file_path = location["file"].replace("file://", "")
-                loc_parts.append(file_path)
-            if location.get("line"):
-                loc_parts.append(f"line {location['line']}")
-
-            location_str = ":".join(loc_parts) if loc_parts else "unknown location"
-
-            lines.append(f"{i}. {message}")
-            lines.append(f"   Location: {location_str}")
-            lines.append("")
-
-        if len(errors) > limit:
-            lines.append(f"... and {len(errors) - limit} more errors")
-
-        return "\n".join(lines)
+        return _format_diagnostics(errors, "error", limit)
 
     @staticmethod
     def format_warnings(warnings: list[dict], limit: int = BUILD_VERBOSE_CAP) -> str:
@@ -172,34 +146,7 @@ class OutputFormatter:
         Returns:
             Formatted warning list
         """
-        if not warnings:
-            return "No warnings found."
-
-        lines = [f"Warnings ({len(warnings)}):"]
-        lines.append("")
-
-        for i, warning in enumerate(warnings[:limit], 1):
-            message = warning.get("message", "Unknown warning")
-            location = warning.get("location", {})
-
-            # Format location
-            loc_parts = []
-            if location.get("file"):
-                file_path = location["file"].replace("file://", "")
-                loc_parts.append(file_path)
-            if location.get("line"):
-                loc_parts.append(f"line {location['line']}")
-
-            location_str = ":".join(loc_parts) if loc_parts else "unknown location"
-
-            lines.append(f"{i}. {message}")
-            lines.append(f"   Location: {location_str}")
-            lines.append("")
-
-        if len(warnings) > limit:
-            lines.append(f"... and {len(warnings) - limit} more warnings")
-
-        return "\n".join(lines)
+        return _format_diagnostics(warnings, "warning", limit)
 
     @staticmethod
     def format_log(log: str, lines: int = BUILD_LOG_TAIL) -> str:
@@ -216,14 +163,18 @@ class OutputFormatter:
         if not log:
             return "No build log available."
 
-        log_lines = log.strip().split("\n")
+        text = log.strip()
+        total = text.count("\n") + 1
 
-        if len(log_lines) <= lines:
+        if total <= lines:
             return log
 
-        # Show last N lines
-        excerpt = log_lines[-lines:]
-        return f"... (showing last {lines} lines of {len(log_lines)})\n\n" + "\n".join(excerpt)
+        # Show last N lines: walk back N newlines and slice, rather than
+        # splitting a multi-megabyte log into a list just to keep its tail
+        start = len(text)
+        for _ in range(lines):
+            start = text.rfind("\n", 0, start)
+        return f"... (showing last {lines} lines of {total})\n\n" + text[start + 1 :]
 
     @staticmethod
     def format_json(data: dict) -> str:
@@ -306,26 +257,19 @@ class OutputFormatter:
         Returns:
             Verbose formatted output
         """
-        lines = []
-
         # Header
         if test_info:
-            total = test_info.get("total", 0)
-            passed = test_info.get("passed", 0)
-            failed = test_info.get("failed", 0)
-            duration = test_info.get("duration", 0.0)
-
+            get = test_info.get
+            failed = get("failed", 0)
             test_status = "PASS" if failed == 0 else "FAIL"
-            lines.append(f"Tests: {test_status}")
-            lines.append(f"  Total: {total}")
-            lines.append(f"  Passed: {passed}")
-            lines.append(f"  Failed: {failed}")
-            lines.append(f"  Duration: {duration:.1f}s")
+            header = (
+                f"Tests: {test_status}\n  Total: {get('total', 0)}\n  Passed: {get('passed', 0)}"
+                f"\n  Failed: {failed}\n  Duration: {get('duration', 0.0):.1f}s"
+            )
         else:
-            lines.append(f"Build: {status}")
+            header = f"Build: {status}"
 
-        lines.append(f"XCResult: {xcresult_id}")
-        lines.append("")
+        lines = [f"{header}\nXCResult: {xcresult_id}\n"]
 
         # Errors
         if errors and len(errors) > 0:
@@ -341,3 +285,49 @@ class OutputFormatter:
         lines.append(f"Summary: {error_count} errors, {warning_count} warnings")
 
         return "\n".join(lines)
+
+
+def _format_location(location: dict) -> str:
+    """Render an issue location as "path:line N" (file:// prefix stripped)."""
+    file_path = location.get("file")
+    line = location.get("line")
+
+    if file_path and file_path.startswith("file://"):
+        file_path = file_path[7:]
+
+    if file_path and line:
+        return f"{file_path}:line {line}"
+    if file_path:
+        return file_path
+    if line:
+        return f"line {line}"
+    return "unknown location"
+
+
+def _format_diagnostics(items: list[dict], kind: str, limit: int) -> str:
+    """
+    Format errors or warnings as a numbered list with locations.
+
+    Args:
+        items: Issue dicts with message and location
+        kind: "error" or "warning" (used in headings and fallbacks)
+        limit: Maximum items to show
+
+    Returns:
+        Formatted list
+    """
+    if not items:
+        return f"No {kind}s found."
+
+    entries = [
+        f"{i}. {item.get('message', f'Unknown {kind}')}\n"
+        f"   Location: {_format_location(item.get('location', {}))}\n"
+        for i, item in enumerate(items[:limit], 1)
+    ]
+    # Blank line between entries, matching the old line-list join
+    out = f"{kind.capitalize()}s ({len(items)}):\n\n" + "\n".join(entries)
+
+    if len(items) > limit:
+        out += f"\n... and {len(items) - limit} more {kind}s"
+
+    return out
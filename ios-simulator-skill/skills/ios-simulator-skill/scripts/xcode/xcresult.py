@@ -8,9 +8,36 @@ import json
 import re
 import subprocess
 import sys
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
+from common.json_utils import loads_json
+
+from .cache import XCResultCache
+
+# Stderr fallback patterns, compiled once at import rather than on every parse.
+# Swift/Clang compilation errors (e.g., "/path/file.swift:135:59: error: message")
+_COMPILATION_ERROR_RE = re.compile(
+    r"^(?P<file>[^:]+):(?P<line>\d+):(?P<column>\d+):\s*error:\s*(?P<message>.+?)$", re.MULTILINE
+)
+# xcodebuild top-level errors (e.g., "xcodebuild: error: Unable to find...")
+_XCODEBUILD_ERROR_RE = re.compile(r"xcodebuild:\s*error:\s*(?P<message>.*?)(?:\n\n|\Z)", re.DOTALL)
+_PROVISIONING_ERROR_RE = re.compile(
+    r"error:.*?provisioning profile.*?(?:doesn't|does not|cannot).*?(?P<message>.*?)(?:\n|$)",
+    re.IGNORECASE,
+)
+_SIGNING_ERROR_RE = re.compile(
+    r"error:.*?(?:code sign|signing).*?(?P<message>.*?)(?:\n|$)", re.IGNORECASE
+)
+_GENERIC_ERROR_RE = re.compile(
+    r"^(?:\*\*\s)?(?:error|❌):\s*(?P<message>.*?)(?:\n|$)", re.MULTILINE
+)
+_NO_PROFILE_RE = re.compile(r"No profiles for '(?P<bundle_id>.*?)' were found")
+
+# Shared read-only fallback for missing xcresult wrapper objects ({"_value": ...})
+_EMPTY: dict = {}
+
 
 class XCResultParser:
     """
@@ -20,20 +47,44 @@ class XCResultParser:
     xcresult bundle format.
     """
 
-    def __init__(self, xcresult_path: Path, stderr: str = ""):
+    def __init__(self, xcresult_path: Path, stderr: str = "", cache: XCResultCache | None = None):
         """
         Initialize parser.
 
         Args:
             xcresult_path: Path to xcresult bundle
             stderr: Optional stderr output for fallback parsing
+            cache: Cache the bundle lives in; xcresulttool outputs are then
+                persisted beside it and reused across invocations
         """
         self.xcresult_path = xcresult_path
         self.stderr = stderr
+        self.cache = cache
 
         if xcresult_path and not xcresult_path.exists():
             raise FileNotFoundError(f"XCResult bundle not found: {xcresult_path}")
 
+    @cached_property
+    def build_results(self) -> dict | None:
+        """Build results JSON, exported once per parser (None on error)."""
+        return self._run_xcresulttool(["get", "build-results"])
+
+    @cached_property
+    def test_results(self) -> dict | None:
+        """Test results summary JSON, exported once per parser (None on error)."""
+        return self._run_xcresulttool(["get", "test-results", "summary"])
+
+    @cached_property
+    def test_nodes(self) -> dict | list | None:
+        """Per-test results tree JSON, exported once per parser (None on error)."""
+        return self._run_xcresulttool(["get", "test-results", "tests"])
+
+    @cached_property
+    def build_log(self) -> str | None:
+        """Build log text, exported once per parser (None on error or empty)."""
+        result = self._run_xcresulttool(["get", "log", "--type", "build"], parse_json=False)
+        return result if result else None
+
     def get_build_results(self) -> dict | None:
         """
         Get build results as JSON.
@@ -41,7 +92,7 @@ class XCResultParser:
         Returns:
             Parsed JSON dict or None on error
         """
-        return self._run_xcresulttool(["get", "build-results"])
+        return self.build_results
 
     def get_test_results(self) -> dict | None:
         """
@@ -50,7 +101,38 @@ class XCResultParser:
         Returns:
             Parsed JSON dict or None on error
         """
-        return self._run_xcresulttool(["get", "test-results", "summary"])
+        return self.test_results
+
+    def get_test_summary(self) -> dict | None:
+        """
+        Get normalized test counts from the xcresult summary.
+
+        Maps xcresulttool's summary fields (totalTestCount, passedTests,
+        failedTests, skippedTests, startTime/finishTime) onto the keys the
+        formatters expect.
+
+        Returns:
+            Dict with total, passed, failed, skipped, duration or None on error
+        """
+        summary = self.test_results
+        if not isinstance(summary, dict):
+            return None
+
+        start = summary.get("startTime")
+        finish = summary.get("finishTime")
+        duration = (
+            finish - start
+            if isinstance(start, int | float) and isinstance(finish, int | float)
+            else 0.0
+        )
+
+        return {
+            "total": summary.get("totalTestCount", 0),
+            "passed": summary.get("passedTests", 0),
+            "failed": summary.get("failedTests", 0),
+            "skipped": summary.get("skippedTests", 0),
+            "duration": max(duration, 0.0),
+        }
 
     def get_failed_tests(self) -> list[dict]:
         """
@@ -61,7 +143,7 @@ class XCResultParser:
             Returns [] if parsing fails or no failures found.
         """
         try:
-            data = self._run_xcresulttool(["get", "test-results", "tests"])
+            data = self.test_nodes
             if not data:
                 return []
 
@@ -96,7 +178,7 @@ class XCResultParser:
                 )
 
             # Recurse into children
-            children = node.get("children", [])
+            children = node.get("children") or ()
             self._collect_failed_tests(children, failed)
 
     def get_build_log(self) -> str | None:
@@ -106,8 +188,7 @@ class XCResultParser:
         Returns:
             Build log string or None on error
         """
-        result = self._run_xcresulttool(["get", "log", "--type", "build"], parse_json=False)
-        return result if result else None
+        return self.build_log
 
     def count_issues(self) -> tuple[int, int]:
         """
@@ -119,7 +200,7 @@ class XCResultParser:
         error_count = 0
         warning_count = 0
 
-        build_results = self.get_build_results()
+        build_results = self.build_results
 
         if build_results:
             try:
@@ -131,18 +212,9 @@ class XCResultParser:
 
                 # If not found, try legacy format: actions[0].buildResult.issues
                 if error_count == 0 and warning_count == 0:
-                    actions = build_results.get("actions", {}).get("_values", [])
-                    if actions:
-                        build_result = actions[0].get("buildResult", {})
-                        issues = build_result.get("issues", {})
-
-                        # Count errors
-                        error_summaries = issues.get("errorSummaries", {}).get("_values", [])
-                        error_count = len(error_summaries)
-
-                        # Count warnings
-                        warning_summaries = issues.get("warningSummaries", {}).get("_values", [])
-                        warning_count = len(warning_summaries)
+                    error_summaries, warning_summaries = self._legacy_issues(build_results)
+                    error_count = len(error_summaries)
+                    warning_count = len(warning_summaries)
 
             except (KeyError, IndexError, TypeError) as e:
                 print(f"Warning: Could not parse issue counts from xcresult: {e}", file=sys.stderr)
@@ -161,41 +233,33 @@ class XCResultParser:
         Returns:
             List of error dicts with message, file, line info
         """
-        build_results = self.get_build_results()
+        build_results = self.build_results
         errors = []
 
         # Try to get errors from xcresult
         if build_results:
             try:
                 # Try top-level errors first (newer xcresult format)
-                if "errors" in build_results and isinstance(build_results.get("errors"), list):
-                    for error in build_results["errors"]:
-                        errors.append(
-                            {
-                                "message": error.get("message", "Unknown error"),
-                                "type": error.get("issueType", "error"),
-                                "location": self._extract_location_from_url(error.get("sourceURL")),
-                            }
-                        )
-
-                # If not found, try legacy format: actions[0].buildResult.issues
-                if not errors:
-                    actions = build_results.get("actions", {}).get("_values", [])
-                    if actions:
-                        build_result = actions[0].get("buildResult", {})
-                        issues = build_result.get("issues", {})
-                        error_summaries = issues.get("errorSummaries", {}).get("_values", [])
-
-                        for error in error_summaries:
-                            errors.append(
-                                {
-                                    "message": error.get("message", {}).get(
-                                        "_value", "Unknown error"
-                                    ),
-                                    "type": error.get("issueType", {}).get("_value", "error"),
-                                    "location": self._extract_location(error),
-                                }
-                            )
+                top_level = build_results.get("errors")
+                if isinstance(top_level, list) and top_level:
+                    errors = [
+                        {
+                            "message": error.get("message", "Unknown error"),
+                            "type": error.get("issueType", "error"),
+                            "location": self._extract_location_from_url(error.get("sourceURL")),
+                        }
+                        for error in top_level
+                    ]
+                # Otherwise legacy format: actions[0].buildResult.issues
+                elif summaries := self._legacy_issues(build_results)[0]:
+                    errors = [
+                        {
+                            "message": error.get("message", {}).get("_value", "Unknown error"),
+                            "type": error.get("issueType", {}).get("_value", "error"),
+                            "location": self._extract_location(error),
+                        }
+                        for error in summaries
+                    ]
 
             except (KeyError, IndexError, TypeError) as e:
                 print(f"Warning: Could not parse errors from xcresult: {e}", file=sys.stderr)
@@ -213,47 +277,60 @@ class XCResultParser:
         Returns:
             List of warning dicts with message, file, line info
         """
-        build_results = self.get_build_results()
+        build_results = self.build_results
         if not build_results:
             return []
 
-        warnings = []
-
         try:
             # Try top-level warnings first (newer xcresult format)
-            if "warnings" in build_results and isinstance(build_results.get("warnings"), list):
-                for warning in build_results["warnings"]:
-                    warnings.append(
-                        {
-                            "message": warning.get("message", "Unknown warning"),
-                            "type": warning.get("issueType", "warning"),
-                            "location": self._extract_location_from_url(warning.get("sourceURL")),
-                        }
-                    )
-
-            # If not found, try legacy format: actions[0].buildResult.issues
-            if not warnings:
-                actions = build_results.get("actions", {}).get("_values", [])
-                if not actions:
-                    return []
-
-                build_result = actions[0].get("buildResult", {})
-                issues = build_result.get("issues", {})
-                warning_summaries = issues.get("warningSummaries", {}).get("_values", [])
+            top_level = build_results.get("warnings")
+            if isinstance(top_level, list) and top_level:
+                return [
+                    {
+                        "message": warning.get("message", "Unknown warning"),
+                        "type": warning.get("issueType", "warning"),
+                        "location": self._extract_location_from_url(warning.get("sourceURL")),
+                    }
+                    for warning in top_level
+                ]
 
-                for warning in warning_summaries:
-                    warnings.append(
-                        {
-                            "message": warning.get("message", {}).get("_value", "Unknown warning"),
-                            "type": warning.get("issueType", {}).get("_value", "warning"),
-                            "location": self._extract_location(warning),
-                        }
-                    )
+            # Otherwise legacy format: actions[0].buildResult.issues (green builds stop here)
+            summaries = self._legacy_issues(build_results)[1]
+            if not summaries:
+                return []
+            return [
+                {
+                    "message": warning.get("message", {}).get("_value", "Unknown warning"),
+                    "type": warning.get("issueType", {}).get("_value", "warning"),
+                    "location": self._extract_location(warning),
+                }
+                for warning in summaries
+            ]
 
         except (KeyError, IndexError, TypeError) as e:
             print(f"Warning: Could not parse warnings: {e}", file=sys.stderr)
+            return []
 
-        return warnings
+    @staticmethod
+    def _legacy_issues(build_results: dict) -> tuple[list, list]:
+        """
+        Get issue summaries from the legacy actions[0].buildResult.issues layout.
+
+        Args:
+            build_results: Parsed build-results JSON
+
+        Returns:
+            Tuple of (error summaries, warning summaries); empty when absent
+        """
+        actions = build_results.get("actions", {}).get("_values", [])
+        if not actions:
+            return ([], [])
+
+        issues = actions[0].get("buildResult", {}).get("issues", {})
+        return (
+            issues.get("errorSummaries", {}).get("_values", []),
+            issues.get("warningSummaries", {}).get("_values", []),
+        )
 
     def _extract_location(self, issue: dict) -> dict:
         """
@@ -265,17 +342,18 @@ class XCResultParser:
         Returns:
             Location dict with file, line, column
         """
-        location = {"file": None, "line": None, "column": None}
-
-        try:
-            doc_location = issue.get("documentLocationInCreatingWorkspace", {})
-            location["file"] = doc_location.get("url", {}).get("_value")
-            location["line"] = doc_location.get("startingLineNumber", {}).get("_value")
-            location["column"] = doc_location.get("startingColumnNumber", {}).get("_value")
-        except (KeyError, TypeError):
-            pass
+        doc_location = issue.get("documentLocationInCreatingWorkspace")
+        if doc_location:
+            try:
+                return {
+                    "file": (doc_location.get("url") or _EMPTY).get("_value"),
+                    "line": (doc_location.get("startingLineNumber") or _EMPTY).get("_value"),
+                    "column": (doc_location.get("startingColumnNumber") or _EMPTY).get("_value"),
+                }
+            except (AttributeError, TypeError):
+                pass
 
-        return location
+        return {"file": None, "line": None, "column": None}
 
     def _extract_location_from_url(self, source_url: str | None) -> dict:
         """
@@ -331,6 +409,10 @@ class XCResultParser:
         """
         Run xcresulttool command.
 
+        Callers go through the cached_property exports above, so each query
+        runs at most once per parser; with a cache, successful outputs are
+        also persisted for later parsers of the same bundle.
+
         Args:
             args: Command arguments (after 'xcresulttool')
             parse_json: Whether to parse output as JSON
@@ -342,22 +424,31 @@ class XCResultParser:
             return None
 
         cmd = ["xcrun", "xcresulttool"] + args + ["--path", str(self.xcresult_path)]
+        xcresult_id = self.xcresult_path.stem if self.cache else None
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-            if parse_json:
-                return json.loads(result.stdout)
-            return result.stdout
+            # Outputs of earlier invocations on the same (unchanged) bundle
+            stdout = self.cache.get_query(xcresult_id, args) if xcresult_id else None
+            fresh = stdout is None
+            if fresh:
+                # Raw bytes: the JSON decoder takes them directly, skipping a
+                # full UTF-8 decode of a potentially multi-megabyte document
+                stdout = subprocess.run(cmd, capture_output=True, check=True).stdout
+            output = loads_json(stdout) if parse_json else stdout.decode(errors="replace")
 
         except subprocess.CalledProcessError as e:
             print(f"Error running xcresulttool: {e}", file=sys.stderr)
-            print(f"stderr: {e.stderr}", file=sys.stderr)
+            print(f"stderr: {e.stderr.decode(errors='replace')}", file=sys.stderr)
             return None
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
             print(f"Error parsing JSON from xcresulttool: {e}", file=sys.stderr)
             return None
 
+        # Persist only output that parsed, so a truncated export isn't replayed
+        if fresh and xcresult_id:
+            self.cache.save_query(xcresult_id, args, stdout)
+        return output
+
     def _parse_stderr_errors(self) -> list[dict]:
         """
         Parse common errors from stderr output as fallback.
@@ -367,15 +458,23 @@ class XCResultParser:
         """
         errors = []
 
-        if not self.stderr:
+        stderr = self.stderr
+        if not stderr:
             return errors
 
-        # Pattern 0: Swift/Clang compilation errors (e.g., "/path/file.swift:135:59: error: message")
-        compilation_error_pattern = (
-            r"^(?P<file>[^:]+):(?P<line>\d+):(?P<column>\d+):\s*error:\s*(?P<message>.+?)$"
-        )
-        for match in re.finditer(compilation_error_pattern, self.stderr, re.MULTILINE):
-            errors.append(
+        # Literal prefilters: each pattern needs an "error:" token (signing and
+        # provisioning case-insensitively), so skip regex passes that can't match
+        lowered = stderr.lower()
+        has_error = "error:" in stderr
+        has_error_ci = has_error or "error:" in lowered
+
+        # Clean stderr (warnings, progress noise) can't match any pattern
+        if not has_error_ci and "❌:" not in stderr and "No profiles for" not in stderr:
+            return errors
+
+        # Pattern 0: Swift/Clang compilation errors
+        if has_error:
+            errors.extend(
                 {
                     "message": match.group("message").strip(),
                     "type": "compilation",
@@ -385,67 +484,62 @@ class XCResultParser:
                         "column": int(match.group("column")),
                     },
                 }
+                for match in _COMPILATION_ERROR_RE.finditer(stderr)
             )
 
-        # Pattern 1: xcodebuild top-level errors (e.g., "xcodebuild: error: Unable to find...")
-        xcodebuild_error_pattern = r"xcodebuild:\s*error:\s*(?P<message>.*?)(?:\n\n|\Z)"
-        for match in re.finditer(xcodebuild_error_pattern, self.stderr, re.DOTALL):
-            message = match.group("message").strip()
-            # Clean up multi-line messages
-            message = " ".join(line.strip() for line in message.split("\n") if line.strip())
-            errors.append(
-                {
-                    "message": message,
-                    "type": "build",
-                    "location": {"file": None, "line": None, "column": None},
-                }
+        # Pattern 1: xcodebuild top-level errors (multi-line messages joined)
+        if "xcodebuild:" in stderr:
+            errors.extend(
+                _stderr_error(
+                    " ".join(
+                        line.strip() for line in match.group("message").split("\n") if line.strip()
+                    ),
+                    "build",
+                )
+                for match in _XCODEBUILD_ERROR_RE.finditer(stderr)
             )
 
         # Pattern 2: Provisioning profile errors
-        provisioning_pattern = r"error:.*?provisioning profile.*?(?:doesn't|does not|cannot).*?(?P<message>.*?)(?:\n|$)"
-        for match in re.finditer(provisioning_pattern, self.stderr, re.IGNORECASE):
-            errors.append(
-                {
-                    "message": f"Provisioning profile error: {match.group('message').strip()}",
-                    "type": "provisioning",
-                    "location": {"file": None, "line": None, "column": None},
-                }
+        if has_error_ci and "provisioning profile" in lowered:
+            errors.extend(
+                _stderr_error(
+                    f"Provisioning profile error: {match.group('message').strip()}",
+                    "provisioning",
+                )
+                for match in _PROVISIONING_ERROR_RE.finditer(stderr)
             )
 
         # Pattern 3: Code signing errors
-        signing_pattern = r"error:.*?(?:code sign|signing).*?(?P<message>.*?)(?:\n|$)"
-        for match in re.finditer(signing_pattern, self.stderr, re.IGNORECASE):
-            errors.append(
-                {
-                    "message": f"Code signing error: {match.group('message').strip()}",
-                    "type": "signing",
-                    "location": {"file": None, "line": None, "column": None},
-                }
+        if has_error_ci and "sign" in lowered:
+            errors.extend(
+                _stderr_error(f"Code signing error: {match.group('message').strip()}", "signing")
+                for match in _SIGNING_ERROR_RE.finditer(stderr)
             )
 
         # Pattern 4: Generic compilation errors (but not if already captured)
-        if not errors:
-            generic_error_pattern = r"^(?:\*\*\s)?(?:error|❌):\s*(?P<message>.*?)(?:\n|$)"
-            for match in re.finditer(generic_error_pattern, self.stderr, re.MULTILINE):
-                message = match.group("message").strip()
-                errors.append(
-                    {
-                        "message": message,
-                        "type": "build",
-                        "location": {"file": None, "line": None, "column": None},
-                    }
-                )
+        if not errors and (has_error or "❌:" in stderr):
+            errors.extend(
+                _stderr_error(match.group("message").strip(), "build")
+                for match in _GENERIC_ERROR_RE.finditer(stderr)
+            )
 
         # Pattern 5: Specific "No profiles" error
-        if "No profiles for" in self.stderr:
-            no_profile_pattern = r"No profiles for '(?P<bundle_id>.*?)' were found"
-            for match in re.finditer(no_profile_pattern, self.stderr):
-                errors.append(
-                    {
-                        "message": f"No provisioning profile found for bundle ID '{match.group('bundle_id')}'",
-                        "type": "provisioning",
-                        "location": {"file": None, "line": None, "column": None},
-                    }
+        if "No profiles for" in stderr:
+            errors.extend(
+                _stderr_error(
+                    f"No provisioning profile found for bundle ID '{match.group('bundle_id')}'",
+                    "provisioning",
                 )
+                for match in _NO_PROFILE_RE.finditer(stderr)
+            )
 
         return errors
+
+
+def _stderr_error(message: str, error_type: str) -> dict:
+    """Build a stderr-derived error entry (these carry no source location)."""
+    return {
+        "message": message,
+        "type": error_type,
+        "location": {"file": None, "line": None, "column": None},
+    }
@@ -3,3 +3,19 @@
 `pythonpath` is configured in pyproject.toml so tests can `import common.*` and
 `import hang_pipeline` without sys.path mangling.
 """
+
+import pytest
+from common import device_utils, idb_utils
+
+
+@pytest.fixture(autouse=True)
+def _isolated_booted_cache(tmp_path, monkeypatch):
+    """Keep the booted-UDID cache per-test so simctl stubs are always consulted."""
+    monkeypatch.setattr(device_utils, "BOOTED_CACHE_FILE", tmp_path / "booted.json")
+    monkeypatch.setattr(device_utils, "_booted_cache", {})
+
+
+@pytest.fixture(autouse=True)
+def _isolated_tree_cache(tmp_path, monkeypatch):
+    """Keep navigator's disk tree cache out of the real home directory."""
+    monkeypatch.setattr(idb_utils, "TREE_CACHE_DIR", tmp_path / "trees")
@@ -0,0 +1,175 @@
+"""Tests for `AppStateCapture.capture_all` artifact assembly.
+
+simctl and idb never run here: each capture step is stubbed, so these pin how
+the concurrently gathered results land in the summary and capture directory.
+"""
+
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import app_state_capture as capture_module
+import pytest
+from app_state_capture import AppStateCapture
+
+
+def _stub_captures(monkeypatch, tmp_path, barrier=None):
+    """Stub the four capture steps; with a barrier, each blocks until all have started."""
+
+    def _wait():
+        if barrier:
+            barrier.wait(timeout=5)
+
+    def _screenshot(udid, size, inline, app_name):
+        _wait()
+        shot = tmp_path / "shot.png"
+        shot.write_bytes(b"png")
+        return {"file_path": str(shot), "size_bytes": 3}
+
+    def _tree(self, path):
+        _wait()
+        path.write_text("{}")
+        return {"captured": True, "element_count": 7}
+
+    def _logs(self, path, line_limit):
+        _wait()
+        return {"captured": True, "lines": 2, "warnings": 0, "errors": 1}
+
+    def _device(self):
+        _wait()
+        return {"name": "iPhone 16", "udid": "TEST-UDID", "state": "Booted"}
+
+    monkeypatch.setattr(capture_module, "capture_screenshot", _screenshot)
+    monkeypatch.setattr(AppStateCapture, "capture_accessibility_tree", _tree)
+    monkeypatch.setattr(AppStateCapture, "capture_logs", _logs)
+    monkeypatch.setattr(AppStateCapture, "capture_device_info", _device)
+
+
+def test_capture_steps_run_concurrently(monkeypatch, tmp_path):
+    # Deadlocks (barrier timeout -> BrokenBarrierError) if the steps ran serially
+    _stub_captures(monkeypatch, tmp_path, barrier=threading.Barrier(4))
+    summary = AppStateCapture(app_bundle_id="com.example.Demo").capture_all(str(tmp_path))
+    assert summary["logs"]["errors"] == 1
+
+
+def test_capture_all_writes_artifacts(monkeypatch, tmp_path):
+    _stub_captures(monkeypatch, tmp_path)
+    summary = AppStateCapture(app_bundle_id="com.example.Demo").capture_all(str(tmp_path / "out"))
+
+    capture_dir = tmp_path / "out" / summary["output_dir"].rsplit("/", 1)[-1]
+    assert summary["accessibility"] == {"captured": True, "element_count": 7}
+    assert summary["device"]["udid"] == "TEST-UDID"
+    assert (capture_dir / "screenshot.png").read_bytes() == b"png"
+    assert json.loads((capture_dir / "device-info.json").read_text())["state"] == "Booted"
+    assert sorted(p.name for p in capture_dir.iterdir()) == [
+        "accessibility-tree.json",
+        "device-info.json",
+        "screenshot.png",
+        "summary.json",
+        "summary.md",
+    ]
+
+
+def test_tree_is_compact_unless_pretty(monkeypatch, tmp_path):
+    tree = {"type": "Window", "children": [{"type": "Button"}]}
+    monkeypatch.setattr(capture_module, "get_accessibility_tree", lambda *_a, **_k: tree)
+
+    AppStateCapture().capture_accessibility_tree(tmp_path / "compact.json")
+    AppStateCapture(pretty=True).capture_accessibility_tree(tmp_path / "pretty.json")
+    assert b"\n" not in (tmp_path / "compact.json").read_bytes()
+    assert json.loads((tmp_path / "pretty.json").read_text()) == tree
+    assert (tmp_path / "pretty.json").read_text().count("\n") > 3
+
+
+# === log tail ===
+
+
+def test_tail_command_keeps_last_lines():
+    cmd = [sys.executable, "-c", "for i in range(5000): print(f'line {i}')"]
+    assert AppStateCapture._tail_command(cmd, 3, timeout=30) == [
+        "line 4997",
+        "line 4998",
+        "line 4999",
+    ]
+
+
+def test_tail_command_kills_on_timeout():
+    cmd = [sys.executable, "-c", "import time; print('start', flush=True); time.sleep(30)"]
+    with pytest.raises(subprocess.TimeoutExpired):
+        AppStateCapture._tail_command(cmd, 10, timeout=0.2)
+
+
+# Prints, then leaves a child holding the inherited stdout pipe
+_LINGERING_CHILD = (
+    "import subprocess, sys\n"
+    "print('last line', flush=True)\n"
+    "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(20)'])\n"
+)
+
+
+def test_tail_command_does_not_wait_for_children_holding_stdout(monkeypatch):
+    monkeypatch.setattr(capture_module, "TAIL_DRAIN_SECONDS", 0.5)
+    start = time.monotonic()
+    cmd = [sys.executable, "-c", _LINGERING_CHILD]
+    assert AppStateCapture._tail_command(cmd, 10, timeout=30) == ["last line"]
+    assert time.monotonic() - start < 10
+
+
+def test_tail_command_timeout_does_not_wait_for_children(monkeypatch):
+    monkeypatch.setattr(capture_module, "TAIL_DRAIN_SECONDS", 0.5)
+    start = time.monotonic()
+    cmd = [sys.executable, "-c", _LINGERING_CHILD + "import time; time.sleep(30)"]
+    with pytest.raises(subprocess.TimeoutExpired):
+        AppStateCapture._tail_command(cmd, 10, timeout=0.5)
+    assert time.monotonic() - start < 10
+
+
+def test_capture_logs_counts_lines_with_issues(monkeypatch, tmp_path):
+    lines = ["Error: disk full", "warning: slow", "ERROR and Warning", "ok"]
+    monkeypatch.setattr(AppStateCapture, "_tail_command", staticmethod(lambda *_a: lines))
+    result = AppStateCapture(app_bundle_id="com.example.Demo").capture_logs(tmp_path / "logs.txt")
+    assert result == {"captured": True, "lines": 4, "warnings": 2, "errors": 2}
+    assert (tmp_path / "logs.txt").read_text() == "\n".join(lines)
+
+
+# === device info ===
+
+DEVICES = {
+    "devices": {
+        "com.apple.CoreSimulator.SimRuntime.iOS-18-0": [
+            {"name": "iPhone 16", "udid": "AAAA", "state": "Shutdown"},
+            {"name": "iPhone 16 Pro", "udid": "BBBB", "state": "Booted"},
+        ]
+    }
+}
+
+
+@pytest.fixture
+def simctl_devices(monkeypatch):
+    monkeypatch.setattr(
+        subprocess,
+        "run",
+        lambda cmd, *_a, **_k: subprocess.CompletedProcess(cmd, 0, json.dumps(DEVICES), ""),
+    )
+
+
+def test_device_info_picks_requested_udid(simctl_devices):
+    assert AppStateCapture(udid="AAAA").capture_device_info() == {
+        "name": "iPhone 16",
+        "udid": "AAAA",
+        "state": "Shutdown",
+    }
+
+
+def test_device_info_defaults_to_booted(simctl_devices):
+    assert AppStateCapture().capture_device_info()["udid"] == "BBBB"
+    assert AppStateCapture(udid="MISSING").capture_device_info() == {}
+
+
+def test_summary_timestamp_matches_directory(monkeypatch, tmp_path):
+    _stub_captures(monkeypatch, tmp_path)
+    summary = AppStateCapture().capture_all(str(tmp_path / "out"))
+    stamp = summary["timestamp"][:19].replace("-", "").replace("T", "-").replace(":", "")
+    assert summary["output_dir"].endswith(f"app-state-{stamp}")
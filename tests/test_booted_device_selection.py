@@ -8,20 +8,38 @@ keeps the first-match behaviour but emits a stderr warning on ambiguity, and
 exposes `get_booted_device_udids()` so callers can detect the multi-device case.
 """
 
+import json
+import os
 import subprocess
 
 import pytest
-from common.device_utils import get_booted_device_udid, get_booted_device_udids
+from common import device_utils
+from common.device_utils import (
+    get_booted_device_udid,
+    get_booted_device_udids,
+    invalidate_booted_cache,
+    is_device_booted,
+    resolve_udid,
+)
 
 UDID_A = "AAAAAAAA-1111-2222-3333-444444444444"
 UDID_B = "BBBBBBBB-5555-6666-7777-888888888888"
 
 
-def _fake_simctl(stdout: str):
+def _listing(**runtimes: list[str]) -> bytes:
+    """Build `simctl list devices -j booted` output from runtime -> booted UDIDs."""
+    devices = {
+        runtime: [{"name": "iPhone 17 Pro", "udid": udid, "state": "Booted"} for udid in udids]
+        for runtime, udids in runtimes.items()
+    }
+    return json.dumps({"devices": devices}).encode()
+
+
+def _fake_simctl(stdout: bytes):
     """Return a subprocess.run stub that yields the given booted-device listing."""
 
     def _run(*_args, **_kwargs):
-        return subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout, stderr="")
+        return subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout, stderr=b"")
 
     return _run
 
@@ -30,17 +48,13 @@ def _fake_simctl(stdout: str):
 
 
 def test_lists_all_booted_udids(monkeypatch):
-    listing = (
-        f"-- iOS 26.2 --\n"
-        f"    iPhone 17 Pro ({UDID_A}) (Booted)\n"
-        f"    iPad Pro ({UDID_B}) (Booted)\n"
-    )
+    listing = _listing(iOS_26_2=[UDID_A], iOS_18_0=[UDID_B])
     monkeypatch.setattr(subprocess, "run", _fake_simctl(listing))
     assert get_booted_device_udids() == [UDID_A, UDID_B]
 
 
 def test_returns_empty_when_none_booted(monkeypatch):
-    monkeypatch.setattr(subprocess, "run", _fake_simctl("== Devices ==\n-- iOS 26.2 --\n"))
+    monkeypatch.setattr(subprocess, "run", _fake_simctl(_listing(iOS_26_2=[])))
     assert get_booted_device_udids() == []
 
 
@@ -52,20 +66,32 @@ def test_returns_empty_when_simctl_fails(monkeypatch):
     assert get_booted_device_udids() == []
 
 
+def test_returns_empty_when_simctl_hangs(monkeypatch):
+    def _hang(cmd, *_args, timeout=None, **_kwargs):
+        assert timeout == device_utils.INTROSPECT_TIMEOUT
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    monkeypatch.setattr(subprocess, "run", _hang)
+    assert get_booted_device_udids() == []
+
+
+def test_returns_empty_on_malformed_json(monkeypatch):
+    monkeypatch.setattr(subprocess, "run", _fake_simctl(b"-- iOS 26.2 --\n"))
+    assert get_booted_device_udids() == []
+
+
 # === get_booted_device_udid ===
 
 
 def test_single_device_returns_udid_without_warning(monkeypatch, capsys):
-    listing = f"-- iOS 26.2 --\n    iPhone 17 Pro ({UDID_A}) (Booted)\n"
-    monkeypatch.setattr(subprocess, "run", _fake_simctl(listing))
+    monkeypatch.setattr(subprocess, "run", _fake_simctl(_listing(iOS_26_2=[UDID_A])))
 
     assert get_booted_device_udid() == UDID_A
     assert capsys.readouterr().err == ""
 
 
 def test_multiple_devices_warns_and_picks_first(monkeypatch, capsys):
-    listing = f"    iPhone 17 Pro ({UDID_A}) (Booted)\n    iPad Pro ({UDID_B}) (Booted)\n"
-    monkeypatch.setattr(subprocess, "run", _fake_simctl(listing))
+    monkeypatch.setattr(subprocess, "run", _fake_simctl(_listing(iOS_26_2=[UDID_A, UDID_B])))
 
     assert get_booted_device_udid() == UDID_A
     stderr = capsys.readouterr().err
@@ -75,9 +101,118 @@ def test_multiple_devices_warns_and_picks_first(monkeypatch, capsys):
 
 
 def test_no_device_returns_none(monkeypatch):
-    monkeypatch.setattr(subprocess, "run", _fake_simctl("-- iOS 26.2 --\n"))
+    monkeypatch.setattr(subprocess, "run", _fake_simctl(_listing()))
     assert get_booted_device_udid() is None
 
 
+# === resolve_udid ===
+
+
+def test_explicit_udid_beats_env(monkeypatch):
+    monkeypatch.setenv("IOS_SIM_UDID", UDID_B)
+    assert resolve_udid(UDID_A) == UDID_A
+
+
+def test_env_udid_skips_detection(monkeypatch):
+    monkeypatch.setenv("IOS_SIM_UDID", UDID_B)
+    monkeypatch.setattr(subprocess, "run", None)  # any simctl call would raise
+    assert resolve_udid(None) == UDID_B
+
+
+def test_falls_back_to_booted_detection(monkeypatch):
+    monkeypatch.delenv("IOS_SIM_UDID", raising=False)
+    monkeypatch.setattr(subprocess, "run", _fake_simctl(_listing(iOS_26_2=[UDID_A])))
+    assert resolve_udid(None) == UDID_A
+
+
+# === booted cache ===
+
+
+@pytest.fixture
+def simctl_calls(monkeypatch):
+    """Stub a single-device listing and record each simctl subcommand."""
+    calls = []
+    listing = _listing(iOS_26_2=[UDID_A])
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd[2])
+        return subprocess.CompletedProcess(cmd, 0, stdout=listing, stderr=b"")
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    return calls
+
+
+def test_listing_is_reused_within_ttl(simctl_calls):
+    assert get_booted_device_udid() == UDID_A
+    assert get_booted_device_udids() == [UDID_A]
+    assert len(simctl_calls) == 1
+
+
+def test_cache_file_is_shared_across_processes(simctl_calls, monkeypatch):
+    get_booted_device_udids()
+    # A sibling script starts with an empty in-process cache
+    monkeypatch.setattr(device_utils, "_booted_cache", {})
+    assert get_booted_device_udids() == [UDID_A]
+    assert simctl_calls == ["list", "getenv"]
+
+    monkeypatch.setattr(device_utils, "_booted_cache", {})
+    os.utime(device_utils.BOOTED_CACHE_FILE, (0, 0))
+    get_booted_device_udids()
+    assert simctl_calls.count("list") == 2
+
+
+def test_shared_listing_of_shutdown_device_is_requeried(simctl_calls, monkeypatch):
+    get_booted_device_udids()
+    monkeypatch.setattr(device_utils, "_booted_cache", {})
+    monkeypatch.setattr(device_utils, "is_device_booted", lambda _udid: False)
+    get_booted_device_udids()
+    assert simctl_calls == ["list", "list"]
+
+
+def test_empty_listing_is_requeried(monkeypatch):
+    calls = []
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd[2])
+        return subprocess.CompletedProcess(cmd, 0, stdout=_listing(), stderr=b"")
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    assert get_booted_device_udids() == []
+    assert get_booted_device_udids() == []
+    assert not device_utils.BOOTED_CACHE_FILE.exists()
+
+    # An empty listing shared by a sibling is not trusted either
+    device_utils._write_booted_cache_file([])
+    assert get_booted_device_udids() == []
+    assert calls == ["list", "list", "list"]
+
+
+def test_is_device_booted_follows_getenv_exit_code(monkeypatch):
+    monkeypatch.setattr(
+        subprocess, "run", lambda cmd, *_a, **_k: subprocess.CompletedProcess(cmd, 149)
+    )
+    assert is_device_booted(UDID_A) is False
+    monkeypatch.setattr(
+        subprocess, "run", lambda cmd, *_a, **_k: subprocess.CompletedProcess(cmd, 0)
+    )
+    assert is_device_booted(UDID_A) is True
+
+
+def test_invalidate_forces_requery(simctl_calls):
+    get_booted_device_udids()
+    invalidate_booted_cache()
+    assert not device_utils.BOOTED_CACHE_FILE.exists()
+    get_booted_device_udids()
+    assert len(simctl_calls) == 2
+
+
+def test_cache_disabled_always_queries(simctl_calls, monkeypatch):
+    monkeypatch.setattr(device_utils, "BOOTED_CACHE_SECONDS", 0)
+    get_booted_device_udids()
+    get_booted_device_udids()
+    assert len(simctl_calls) == 2
+    assert not device_utils.BOOTED_CACHE_FILE.exists()
+
+
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__, "-v"]))
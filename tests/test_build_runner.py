@@ -0,0 +1,620 @@
+"""Tests for `BuildRunner` scheme/simulator detection, caching and command construction.
+
+xcodebuild itself never runs here: `subprocess.run` is stubbed and the
+XCResult cache points at a temp dir, so these exercise only the Python-side
+caching and argument assembly.
+"""
+
+import json
+import os
+import plistlib
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from xcode import BuildRunner, XCResultCache
+from xcode.builder import _run_xcodebuild, _xcode_version
+
+LIST_OUTPUT = json.dumps(
+    {
+        "project": {
+            "configurations": ["Debug", "Release"],
+            "name": "Demo",
+            "schemes": ["Demo", "DemoTests"],
+            "targets": ["Demo", "DemoTests"],
+        }
+    }
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    proj = tmp_path / "Demo.xcodeproj"
+    proj.mkdir()
+    (proj / "project.pbxproj").write_text("// pbx")
+    return proj
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return XCResultCache(cache_dir=tmp_path / "xcresults")
+
+
+@pytest.fixture(autouse=True)
+def _reset_scheme_memo(monkeypatch):
+    monkeypatch.setattr(BuildRunner, "_scheme_memo", {})
+
+
+@pytest.fixture(autouse=True)
+def xcode_version(monkeypatch):
+    version = {"text": "Xcode 16.0 / Build version 16A242d"}
+    monkeypatch.setattr("xcode.builder._xcode_version", lambda: version["text"])
+    return version
+
+
+@pytest.fixture
+def list_calls(monkeypatch):
+    """Stub `xcodebuild -list` and record each invocation."""
+    calls = []
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=LIST_OUTPUT, stderr="")
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    return calls
+
+
+# === auto_detect_scheme ===
+
+
+def test_detects_first_scheme(project, cache, list_calls):
+    runner = BuildRunner(project_path=str(project), cache=cache)
+    assert runner.auto_detect_scheme() == "Demo"
+    assert len(list_calls) == 1
+    assert list_calls[0][:3] == ["xcodebuild", "-list", "-json"]
+
+
+def test_scheme_list_is_cached_across_runners(project, cache, list_calls):
+    BuildRunner(project_path=str(project), cache=cache).auto_detect_scheme()
+    assert BuildRunner(project_path=str(project), cache=cache).auto_detect_scheme() == "Demo"
+    assert len(list_calls) == 1
+
+
+def test_project_edit_invalidates_scheme_cache(project, cache, list_calls):
+    BuildRunner(project_path=str(project), cache=cache).auto_detect_scheme()
+    (project / "project.pbxproj").write_text("// pbx with a new target")
+
+    BuildRunner(project_path=str(project), cache=cache).auto_detect_scheme()
+    assert len(list_calls) == 2
+
+
+def test_scheme_memo_skips_disk_cache(project, cache, list_calls, monkeypatch):
+    BuildRunner(project_path=str(project), cache=cache).auto_detect_scheme()
+    monkeypatch.setattr(cache, "get_schemes", lambda *_a: pytest.fail("disk cache read"))
+    assert BuildRunner(project_path=str(project), cache=cache).auto_detect_scheme() == "Demo"
+
+
+def test_workspace_listing_uses_workspace_key(tmp_path, cache, monkeypatch):
+    workspace = tmp_path / "Demo.xcworkspace"
+    workspace.mkdir()
+    (workspace / "contents.xcworkspacedata").write_text("<Workspace/>")
+    listing = json.dumps({"workspace": {"name": "Demo", "schemes": ["App", "Pods-App"]}})
+    monkeypatch.setattr(
+        subprocess,
+        "run",
+        lambda cmd, *_a, **_k: subprocess.CompletedProcess(cmd, 0, stdout=listing, stderr=""),
+    )
+    assert BuildRunner(workspace_path=str(workspace), cache=cache).auto_detect_scheme() == "App"
+
+
+def test_unparseable_listing_is_not_cached(project, cache, monkeypatch):
+    monkeypatch.setattr(
+        subprocess,
+        "run",
+        lambda cmd, *_a, **_k: subprocess.CompletedProcess(cmd, 0, stdout="not json", stderr=""),
+    )
+    assert BuildRunner(project_path=str(project), cache=cache).auto_detect_scheme() is None
+    assert cache._load_json(cache.SCHEMES_FILE) == {}
+
+
+def test_no_container_skips_xcodebuild(cache, list_calls):
+    assert BuildRunner(cache=cache).auto_detect_scheme() is None
+    assert list_calls == []
+
+
+# === incremental build gate ===
+
+
+@pytest.fixture
+def derived_data(tmp_path, monkeypatch):
+    """Point Xcode's default DerivedData at a temp dir."""
+    root = tmp_path / "DerivedData"
+    monkeypatch.setattr("xcode.builder.XCODE_DERIVED_DATA_DIR", root)
+    return root
+
+
+def _app_bundle(cmd, derived_data):
+    """Where the stubbed build leaves Demo.app, as Xcode would."""
+    if "-derivedDataPath" in cmd:
+        root = Path(cmd[cmd.index("-derivedDataPath") + 1])
+    else:
+        container = Path(cmd[cmd.index("-project") + 1]).resolve()
+        root = derived_data / f"{container.stem}-abcdef"
+        root.mkdir(parents=True, exist_ok=True)
+        (root / "info.plist").write_bytes(plistlib.dumps({"WorkspacePath": str(container)}))
+    return root / "Build" / "Products" / "Debug-iphonesimulator" / "Demo.app"
+
+
+@pytest.fixture
+def xcodebuild_calls(monkeypatch, derived_data):
+    """Stub `_run_xcodebuild` with a successful build and record each command."""
+    calls = []
+
+    def _run(cmd, _timeout):
+        calls.append(cmd)
+        Path(cmd[cmd.index("-resultBundlePath") + 1]).mkdir(parents=True, exist_ok=True)
+        app = _app_bundle(cmd, derived_data)
+        app.mkdir(parents=True, exist_ok=True)
+        (app / "Demo").write_text(f"binary {len(calls)}")
+        return 0, ""
+
+    monkeypatch.setattr("xcode.builder._run_xcodebuild", _run)
+    return calls
+
+
+def _runner(project, cache):
+    runner = BuildRunner(project_path=str(project), scheme="Demo", cache=cache)
+    runner.get_simulator_destination = lambda: "platform=iOS Simulator,id=TEST-UDID"
+    return runner
+
+
+def test_unchanged_sources_reuse_last_success(project, cache, xcodebuild_calls):
+    (project.parent / "App.swift").write_text("let x = 1")
+    ok, first_id, _ = _runner(project, cache).build()
+    assert ok
+
+    ok, second_id, _ = _runner(project, cache).build()
+    assert ok
+    assert second_id == first_id
+    assert len(xcodebuild_calls) == 1
+
+
+def test_source_edit_triggers_rebuild(project, cache, xcodebuild_calls):
+    source = project.parent / "App.swift"
+    source.write_text("let x = 1")
+    _runner(project, cache).build()
+
+    source.write_text("let x = 2 // edited")
+    _runner(project, cache).build()
+    assert len(xcodebuild_calls) == 2
+
+
+@pytest.mark.parametrize(
+    "resource",
+    [
+        "Model.xcdatamodeld/Model.xcdatamodel/contents",
+        "Assets.xcassets/Logo.imageset/logo.png",
+        "Fixtures/user.json",
+        "Shaders/Blur.metal",
+        "Demo.xctestplan",
+    ],
+)
+def test_resource_edit_triggers_rebuild(project, cache, xcodebuild_calls, resource):
+    path = project.parent / resource
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("v1")
+    _runner(project, cache).build()
+
+    path.write_text("v2 edited")
+    _runner(project, cache).build()
+    assert len(xcodebuild_calls) == 2
+
+
+def test_build_products_and_skill_config_are_ignored(project, cache, xcodebuild_calls):
+    _runner(project, cache).build()
+    for rel in ("build/App.o", "DerivedData/x", ".git/index", ".claude/skills/s/config.json"):
+        (project.parent / rel).parent.mkdir(parents=True, exist_ok=True)
+        (project.parent / rel).write_text("changed")
+
+    _runner(project, cache).build()
+    assert len(xcodebuild_calls) == 1
+
+
+def test_local_package_outside_project_is_fingerprinted(tmp_path, cache, xcodebuild_calls):
+    app = tmp_path / "App"
+    project = app / "Demo.xcodeproj"
+    project.mkdir(parents=True)
+    (project / "project.pbxproj").write_text(
+        "AB /* XCLocalSwiftPackageReference */ = {\n"
+        "\tisa = XCLocalSwiftPackageReference;\n\trelativePath = ../Core;\n};\n"
+    )
+    source = tmp_path / "Core" / "Sources" / "Core.swift"
+    source.parent.mkdir(parents=True)
+    source.write_text("let a = 1")
+    _runner(project, cache).build()
+
+    source.write_text("let a = 2 // edited")
+    _runner(project, cache).build()
+    assert len(xcodebuild_calls) == 2
+
+
+def test_force_and_clean_bypass_gate(project, cache, xcodebuild_calls):
+    _runner(project, cache).build()
+
+    _runner(project, cache).build(force=True)
+    _runner(project, cache).build(clean=True)
+    assert len(xcodebuild_calls) == 3
+
+
+def test_missing_bundle_is_not_reused(project, cache, xcodebuild_calls):
+    _, first_id, _ = _runner(project, cache).build()
+    shutil.rmtree(cache.get_path(first_id))
+
+    _runner(project, cache).build()
+    assert len(xcodebuild_calls) == 2
+
+
+def test_missing_product_triggers_rebuild(project, cache, xcodebuild_calls, derived_data):
+    _runner(project, cache).build()
+    shutil.rmtree(_app_bundle(xcodebuild_calls[0], derived_data))
+
+    ok, _, _ = _runner(project, cache).build()
+    assert ok
+    assert len(xcodebuild_calls) == 2
+    assert _app_bundle(xcodebuild_calls[1], derived_data).is_dir()
+
+
+def test_cleaned_derived_data_triggers_rebuild(project, cache, xcodebuild_calls, derived_data):
+    _runner(project, cache).build()
+    shutil.rmtree(derived_data)
+
+    _runner(project, cache).build()
+    assert len(xcodebuild_calls) == 2
+
+
+def test_overwritten_product_triggers_rebuild(project, cache, xcodebuild_calls, derived_data):
+    _runner(project, cache).build()
+    executable = _app_bundle(xcodebuild_calls[0], derived_data) / "Demo"
+    executable.write_text("built by Xcode")
+    os.utime(executable, ns=(0, 0))
+
+    _runner(project, cache).build()
+    assert len(xcodebuild_calls) == 2
+
+
+def test_pinned_derived_data_products_gate_reuse(project, cache, xcodebuild_calls, derived_data):
+    for _ in range(2):
+        runner = _runner(project, cache)
+        runner.pin_derived_data = True
+        runner.build()
+    assert len(xcodebuild_calls) == 1
+
+    shutil.rmtree(_app_bundle(xcodebuild_calls[0], derived_data).parent)
+    runner.build()
+    assert len(xcodebuild_calls) == 2
+
+
+def test_xcode_upgrade_triggers_rebuild(project, cache, xcodebuild_calls, xcode_version):
+    _runner(project, cache).build()
+    xcode_version["text"] = "Xcode 16.1 / Build version 16B40"
+
+    _runner(project, cache).build()
+    assert len(xcodebuild_calls) == 2
+
+
+def test_test_runs_are_not_reused_by_default(project, cache, xcodebuild_calls):
+    _runner(project, cache).test()
+    _runner(project, cache).test()
+    assert len(xcodebuild_calls) == 2
+
+
+def test_passing_test_run_is_reused_per_suite(project, cache, xcodebuild_calls):
+    _, first_id, _ = _runner(project, cache).test(reuse=True)
+    _, second_id, _ = _runner(project, cache).test(reuse=True)
+    assert second_id == first_id
+
+    _runner(project, cache).test(test_suite="DemoTests/LoginTests", reuse=True)
+    _runner(project, cache).test(force=True, reuse=True)
+    assert [cmd[2] for cmd in xcodebuild_calls] == ["test", "test", "test"]
+
+
+def test_resource_edit_invalidates_reused_test_run(project, cache, xcodebuild_calls):
+    fixture = project.parent / "Fixtures" / "login.json"
+    fixture.parent.mkdir()
+    fixture.write_text('{"user": "a"}')
+    _runner(project, cache).test(reuse=True)
+
+    fixture.write_text('{"user": "b", "edited": true}')
+    _runner(project, cache).test(reuse=True)
+    assert len(xcodebuild_calls) == 2
+
+
+def test_build_and_test_gates_are_separate(project, cache, xcodebuild_calls):
+    _runner(project, cache).build()
+    _runner(project, cache).test(reuse=True)
+    assert [cmd[2] for cmd in xcodebuild_calls] == ["build", "test"]
+
+
+# === command construction ===
+
+
+def test_build_parallelizes_targets_with_jobs(project, cache, xcodebuild_calls):
+    runner = _runner(project, cache)
+    runner.jobs = 6
+    runner.build()
+    cmd = xcodebuild_calls[0]
+    assert "-parallelizeTargets" in cmd
+    assert cmd[cmd.index("-jobs") + 1] == "6"
+
+
+def test_build_without_parallelize(project, cache, xcodebuild_calls):
+    runner = _runner(project, cache)
+    runner.parallelize = False
+    runner.build()
+    assert "-parallelizeTargets" not in xcodebuild_calls[0]
+    assert not any(arg.startswith("-IDEBuildOperation") for arg in xcodebuild_calls[0])
+    assert "-jobs" in xcodebuild_calls[0]
+
+
+def test_test_uses_same_parallel_build_args(project, cache, xcodebuild_calls):
+    runner = _runner(project, cache)
+    runner.jobs = 4
+    runner.test()
+    cmd = xcodebuild_calls[0]
+    assert "-parallelizeTargets" in cmd
+    assert cmd[cmd.index("-jobs") + 1] == "4"
+    assert "-IDEBuildOperationMaxNumberOfConcurrentCompileTasks=4" in cmd
+
+
+def test_parallel_testing_defers_to_scheme_by_default(project, cache, xcodebuild_calls):
+    _runner(project, cache).test()
+    assert "-parallel-testing-enabled" not in xcodebuild_calls[0]
+
+
+def test_parallel_testing_with_workers(project, cache, xcodebuild_calls):
+    runner = _runner(project, cache)
+    runner.parallel_testing = True
+    runner.test_workers = 3
+    runner.test()
+    cmd = xcodebuild_calls[0]
+    assert cmd[cmd.index("-parallel-testing-enabled") + 1] == "YES"
+    assert cmd[cmd.index("-parallel-testing-worker-count") + 1] == "3"
+
+
+def test_disabled_parallel_testing_ignores_workers(project, cache, xcodebuild_calls):
+    runner = _runner(project, cache)
+    runner.parallel_testing = False
+    runner.test_workers = 3
+    runner.test()
+    cmd = xcodebuild_calls[0]
+    assert cmd[cmd.index("-parallel-testing-enabled") + 1] == "NO"
+    assert "-parallel-testing-worker-count" not in cmd
+
+
+def test_scheme_detection_runs_alongside_destination_lookup(project, cache, list_calls):
+    runner = BuildRunner(project_path=str(project), cache=cache)
+    runner.get_simulator_destination = lambda: "platform=iOS Simulator,id=TEST-UDID"
+
+    assert runner._resolve_scheme_and_destination() == "platform=iOS Simulator,id=TEST-UDID"
+    assert runner.scheme == "Demo"
+    assert len(list_calls) == 1
+
+
+# === test summary cache ===
+
+
+def test_test_summary_cache_tracks_bundle_info_plist(cache):
+    bundle = cache.get_path("xcresult-1")
+    bundle.mkdir(parents=True)
+    (bundle / "Info.plist").write_text("<plist/>")
+    summary = {"total": 3, "passed": 2, "failed": 1, "skipped": 0, "duration": 1.5}
+    failures = [{"test_name": "testLogin()", "failure_message": "XCTAssertTrue failed"}]
+
+    cache.save_test_summary("xcresult-1", summary, failures)
+    assert cache.get_test_summary("xcresult-1") == {"summary": summary, "failed_tests": failures}
+
+    (bundle / "Info.plist").write_text("<plist>rewritten</plist>")
+    assert cache.get_test_summary("xcresult-1") is None
+
+
+def test_test_summary_cache_miss_without_bundle(cache):
+    cache.save_test_summary("xcresult-missing", {"total": 1}, None)
+    assert cache.get_test_summary("xcresult-missing") is None
+
+
+# === simulator detection ===
+
+SIMCTL_DEVICES = json.dumps(
+    {
+        "devices": {
+            "com.apple.CoreSimulator.SimRuntime.iOS-17-5": [
+                {"name": "iPhone 15", "udid": "UDID-OLD", "isAvailable": True},
+            ],
+            "com.apple.CoreSimulator.SimRuntime.iOS-18-2": [
+                {"name": "iPad Air", "udid": "UDID-IPAD", "isAvailable": True},
+                {"name": "iPhone 16 Pro", "udid": "UDID-NEW", "isAvailable": True},
+            ],
+            "com.apple.CoreSimulator.SimRuntime.watchOS-11-2": [
+                {"name": "Apple Watch", "udid": "UDID-WATCH", "isAvailable": True},
+            ],
+        }
+    }
+)
+
+
+@pytest.fixture
+def device_set(tmp_path, monkeypatch):
+    devices_dir = tmp_path / "Devices"
+    devices_dir.mkdir()
+    (devices_dir / "device_set.plist").write_text("<plist/>")
+    monkeypatch.setattr("xcode.builder.DEVICE_SET_DIR", devices_dir)
+    return devices_dir
+
+
+@pytest.fixture
+def simctl_calls(monkeypatch):
+    calls = []
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=SIMCTL_DEVICES, stderr="")
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    return calls
+
+
+def test_auto_detect_prefers_iphone_on_newest_runtime(cache, device_set, simctl_calls):
+    runner = BuildRunner(cache=cache)
+    assert runner._auto_detect_simulator() == "platform=iOS Simulator,id=UDID-NEW"
+    assert simctl_calls[0] == ["xcrun", "simctl", "list", "-j", "devices", "available"]
+    name = runner._extract_simulator_name_from_destination("platform=iOS Simulator,id=UDID-NEW")
+    assert name == "iPhone 16 Pro"
+
+
+def test_simulator_list_cached_until_device_set_changes(cache, device_set, simctl_calls):
+    BuildRunner(cache=cache)._auto_detect_simulator()
+    assert BuildRunner(cache=cache)._simulator_exists("iPhone 15")
+    assert len(simctl_calls) == 1
+
+    (device_set / "device_set.plist").write_text("<plist>new device</plist>")
+    BuildRunner(cache=cache)._simulator_exists("iPhone 15")
+    assert len(simctl_calls) == 2
+
+
+def test_simulator_exists_requires_exact_name(cache, device_set, simctl_calls):
+    assert not BuildRunner(cache=cache)._simulator_exists("iPhone 16")
+
+
+# === _run_xcodebuild ===
+
+
+def test_run_xcodebuild_keeps_bounded_stderr_tail(monkeypatch):
+    monkeypatch.setattr("xcode.builder.STDERR_MAX_LINES", 3)
+    script = "import sys\nfor i in range(10): print(f'line {i}', file=sys.stderr)\nsys.exit(65)"
+    returncode, stderr = _run_xcodebuild([sys.executable, "-c", script], timeout=30)
+    assert returncode == 65
+    assert stderr == "line 7\nline 8\nline 9\n"
+
+
+def test_run_xcodebuild_timeout_carries_stderr():
+    script = "import sys, time\nprint('compiling', file=sys.stderr, flush=True)\ntime.sleep(30)"
+    with pytest.raises(subprocess.TimeoutExpired) as excinfo:
+        _run_xcodebuild([sys.executable, "-c", script], timeout=1)
+    assert excinfo.value.stderr == "compiling\n"
+
+
+def test_run_xcodebuild_survives_invalid_utf8(monkeypatch):
+    monkeypatch.setattr("xcode.builder.STDERR_MAX_LINES", 6000)
+    # Invalid bytes first, then more output than a pipe buffer holds
+    script = (
+        "import sys\n"
+        "sys.stderr.buffer.write(b'error: bad byte \\xff\\xfe in App.swift\\n')\n"
+        "sys.stderr.buffer.flush()\n"
+        "for i in range(5000): print(f'line {i}', file=sys.stderr)\n"
+        "sys.exit(65)"
+    )
+    returncode, stderr = _run_xcodebuild([sys.executable, "-c", script], timeout=30)
+    assert returncode == 65
+    assert stderr.startswith("error: bad byte \ufffd\ufffd in App.swift\n")
+    assert stderr.endswith("line 4999\n")
+
+
+# Exits at once but leaves a child holding the inherited stderr pipe
+_LINGERING_CHILD = (
+    "import subprocess, sys\n"
+    "print('** BUILD SUCCEEDED **', file=sys.stderr, flush=True)\n"
+    "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(20)'])"
+)
+
+
+def test_run_xcodebuild_does_not_wait_for_children_holding_stderr(monkeypatch):
+    monkeypatch.setattr("xcode.builder.STDERR_DRAIN_SECONDS", 0.5)
+    start = time.monotonic()
+    returncode, stderr = _run_xcodebuild([sys.executable, "-c", _LINGERING_CHILD], timeout=30)
+    assert time.monotonic() - start < 10
+    assert returncode == 0
+    assert stderr == "** BUILD SUCCEEDED **\n"
+
+
+def test_run_xcodebuild_timeout_does_not_wait_for_children(monkeypatch):
+    monkeypatch.setattr("xcode.builder.STDERR_DRAIN_SECONDS", 0.5)
+    script = _LINGERING_CHILD + "\nimport time\ntime.sleep(30)"
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        _run_xcodebuild([sys.executable, "-c", script], timeout=1)
+    assert time.monotonic() - start < 10
+
+
+def test_clean_test_is_a_single_invocation(project, cache, xcodebuild_calls):
+    _runner(project, cache).test(clean=True)
+    assert len(xcodebuild_calls) == 1
+    assert xcodebuild_calls[0][:4] == ["xcodebuild", "-quiet", "clean", "test"]
+
+
+def test_destination_resolved_once_per_runner(cache, device_set, simctl_calls):
+    runner = BuildRunner(cache=cache, simulator=None)
+    runner.cache.get_simulators = lambda _fp: None  # force simctl each resolve
+    first = runner.get_simulator_destination()
+    assert runner.get_simulator_destination() == first
+    assert len(simctl_calls) == 1
+
+    runner.simulator = "iPhone 15"
+    assert runner.get_simulator_destination() == "platform=iOS Simulator,name=iPhone 15"
+
+
+def test_simulator_build_skips_signing_and_package_checks(project, cache, xcodebuild_calls):
+    _runner(project, cache).build()
+    cmd = xcodebuild_calls[0]
+    assert "CODE_SIGNING_ALLOWED=NO" in cmd
+    assert "-skipPackagePluginValidation" in cmd
+    assert "-disableAutomaticPackageResolution" not in cmd
+
+
+def test_pinned_packages_disable_resolution(project, cache, xcodebuild_calls):
+    swiftpm = project / "project.xcworkspace/xcshareddata/swiftpm"
+    swiftpm.mkdir(parents=True)
+    (swiftpm / "Package.resolved").write_text("{}")
+
+    runner = _runner(project, cache)
+    runner.sign = True
+    runner.test()
+    cmd = xcodebuild_calls[0]
+    assert "-disableAutomaticPackageResolution" in cmd
+    assert "CODE_SIGNING_ALLOWED=NO" not in cmd
+
+
+def test_default_derived_data_is_shared_with_xcode(project, cache, xcodebuild_calls):
+    _runner(project, cache).build()
+    assert "-derivedDataPath" not in xcodebuild_calls[0]
+
+
+def test_derived_data_is_pinned_per_project(project, cache, xcodebuild_calls):
+    for action in ("build", "test"):
+        runner = _runner(project, cache)
+        runner.pin_derived_data = True
+        getattr(runner, action)(clean=True)
+    paths = {cmd[cmd.index("-derivedDataPath") + 1] for cmd in xcodebuild_calls}
+    assert len(paths) == 1
+    assert Path(paths.pop()).parent == cache.cache_dir / "DerivedData"
+
+
+def test_xcode_version_is_queried_once(monkeypatch):
+    calls = []
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="Xcode 15.4\nBuild version 15F31d\n")
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    _xcode_version.cache_clear()
+    try:
+        assert _xcode_version() == "Xcode 15.4 / Build version 15F31d"
+        assert _xcode_version() == "Xcode 15.4 / Build version 15F31d"
+    finally:
+        _xcode_version.cache_clear()
+    assert calls == [["xcodebuild", "-version"]]
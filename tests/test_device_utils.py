@@ -0,0 +1,228 @@
+"""Tests for `device_utils` screen-size detection.
+
+idb never runs here: `subprocess.run` is stubbed with canned `ui describe-all`
+output and CoreSimulator plists are laid out under tmp_path, so only the
+parsing, lookup order and memoization are exercised.
+"""
+
+import json
+import plistlib
+import subprocess
+from pathlib import Path
+
+import pytest
+from common import device_utils
+from common.device_utils import (
+    build_idb_command,
+    build_simctl_command,
+    get_device_screen_size,
+    resolve_device_identifier,
+    transform_screenshot_coords,
+    transform_screenshot_points,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_screen_sizes():
+    device_utils._query_screen_size.cache_clear()
+    yield
+    device_utils._query_screen_size.cache_clear()
+
+
+@pytest.fixture
+def describe_calls(monkeypatch):
+    """Stub `idb ui describe-all` with a 402x874 root frame and record calls."""
+    calls = []
+    payload = json.dumps([{"type": "Application", "frame": {"width": 402, "height": 874}}])
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=payload.encode(), stderr=b"")
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    return calls
+
+
+def test_screen_size_is_read_once_per_udid(describe_calls):
+    assert get_device_screen_size("A") == (402, 874)
+    assert get_device_screen_size("A") == (402, 874)
+    assert get_device_screen_size("B") == (402, 874)
+    assert [cmd[-1] for cmd in describe_calls] == ["A", "B"]
+
+
+def test_failed_lookup_falls_back_and_is_retried(monkeypatch, describe_calls):
+    def _boom(cmd, *_args, **_kwargs):
+        raise subprocess.CalledProcessError(1, cmd)
+
+    with monkeypatch.context() as m:
+        m.setattr(subprocess, "run", _boom)
+        assert get_device_screen_size("A") == (390, 844)
+
+    assert get_device_screen_size("A") == (402, 874)
+    assert len(describe_calls) == 1
+
+
+def test_missing_root_frame_falls_back_and_is_retried(monkeypatch, describe_calls):
+    with monkeypatch.context() as m:
+        m.setattr(
+            subprocess, "run", lambda cmd, *_a, **_k: subprocess.CompletedProcess(cmd, 0, b"[]")
+        )
+        assert get_device_screen_size("A") == (390, 844)
+
+    assert get_device_screen_size("A") == (402, 874)
+    assert len(describe_calls) == 1
+
+
+def test_only_root_element_is_decoded(monkeypatch):
+    # Descendants are never parsed, so a truncated tail doesn't matter
+    stdout = b'[{"type": "Application", "frame": {"width": 440, "height": 956}}, {"type": "Bu'
+    monkeypatch.setattr(
+        subprocess, "run", lambda cmd, *_a, **_k: subprocess.CompletedProcess(cmd, 0, stdout)
+    )
+    assert get_device_screen_size("A") == (440, 956)
+
+
+# === device-type profile ===
+
+
+def _write_plist(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(plistlib.dumps(data))
+
+
+@pytest.fixture
+def sim_profiles(tmp_path, monkeypatch):
+    """Lay out a CoreSimulator device and a 1206x2622 @3x device type on disk."""
+    devices, types = tmp_path / "Devices", tmp_path / "DeviceTypes"
+    monkeypatch.setattr(device_utils, "SIM_DEVICES_DIR", devices)
+    monkeypatch.setattr(device_utils, "DEVICE_TYPES_DIRS", (types,))
+    monkeypatch.setattr(device_utils, "_xcode_device_types_dir", lambda: None)
+
+    def _device(udid, device_type, bundle_name, types=types):
+        _write_plist(devices / udid / "device.plist", {"deviceType": device_type})
+        bundle = types / f"{bundle_name}.simdevicetype" / "Contents"
+        _write_plist(bundle / "Info.plist", {"CFBundleIdentifier": device_type})
+        profile = {"mainScreenWidth": 1206, "mainScreenHeight": 2622, "mainScreenScale": 3.0}
+        _write_plist(bundle / "Resources" / "profile.plist", profile)
+
+    return _device
+
+
+def test_profile_plist_avoids_idb(sim_profiles, describe_calls):
+    sim_profiles("A", "com.apple.CoreSimulator.SimDeviceType.iPhone-17-Pro", "iPhone 17 Pro")
+    assert get_device_screen_size("A") == (402, 874)
+    assert describe_calls == []
+
+
+def test_bundle_found_by_identifier_when_name_differs(sim_profiles, describe_calls):
+    sim_profiles(
+        "A",
+        "com.apple.CoreSimulator.SimDeviceType.iPhone-SE-3rd-generation",
+        "iPhone SE (3rd generation)",
+    )
+    assert get_device_screen_size("A") == (402, 874)
+    assert describe_calls == []
+
+
+def test_bundle_found_in_xcode_platform(sim_profiles, describe_calls, tmp_path, monkeypatch):
+    xcode_types = tmp_path / "Xcode.app" / "DeviceTypes"
+    monkeypatch.setattr(device_utils, "_xcode_device_types_dir", lambda: xcode_types)
+    sim_profiles(
+        "A", "com.apple.CoreSimulator.SimDeviceType.iPhone-17-Pro", "iPhone 17 Pro", xcode_types
+    )
+    assert get_device_screen_size("A") == (402, 874)
+    assert describe_calls == []
+
+
+def test_xcode_device_types_dir_is_resolved_once(monkeypatch):
+    calls = []
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "/Applications/Xcode.app/Contents/Developer\n")
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    device_utils._xcode_device_types_dir.cache_clear()
+    try:
+        expected = Path("/Applications/Xcode.app/Contents/Developer/Platforms/")
+        for _ in range(2):
+            types_dir = device_utils._xcode_device_types_dir()
+            assert types_dir.is_relative_to(expected)
+            assert types_dir.name == "DeviceTypes"
+        assert calls == [["xcode-select", "-p"]]
+    finally:
+        device_utils._xcode_device_types_dir.cache_clear()
+
+
+def test_unknown_device_falls_back_to_idb(sim_profiles, describe_calls):
+    assert get_device_screen_size("missing") == (402, 874)
+    assert len(describe_calls) == 1
+
+
+# === coordinate transforms ===
+
+
+def test_points_batch_matches_scalar_transform():
+    points = [(100, 200), (0, 0), (194, 421), (33.5, 7.25)]
+    expected = [transform_screenshot_coords(x, y, 195, 422, 390, 844) for x, y in points]
+    assert transform_screenshot_points(points, 195, 422, 390, 844) == expected
+    assert transform_screenshot_points(iter(points), 195, 422, 390, 844) == expected
+
+
+def test_half_size_screenshot_maps_exactly():
+    # (100 / 195) * 390 == 199.99999999999997 used to truncate to 199
+    assert transform_screenshot_coords(100, 200, 195, 422, 390, 844) == (200, 400)
+    assert transform_screenshot_points([(100, 50), (0, 421)], 195, 422, 390, 844) == [
+        (200, 100),
+        (0, 842),
+    ]
+
+
+# === command building ===
+
+
+def test_simctl_command_defaults_to_booted():
+    assert build_simctl_command("launch", None, "com.app") == [
+        "xcrun",
+        "simctl",
+        "launch",
+        "booted",
+        "com.app",
+    ]
+    assert build_simctl_command("io", "ABC", "screenshot", 1)[3:] == ["ABC", "screenshot", "1"]
+
+
+def test_idb_command_appends_udid_last():
+    assert build_idb_command("ui tap", None, 200, "400") == ["idb", "ui", "tap", "200", "400"]
+    assert build_idb_command("ui describe-all", "ABC", "--json") == [
+        "idb",
+        "ui",
+        "describe-all",
+        "--json",
+        "--udid",
+        "ABC",
+    ]
+
+
+def test_full_udid_resolves_without_simctl(monkeypatch):
+    monkeypatch.setattr(subprocess, "run", None)  # any simctl call would raise
+    udid = "abcd1234-5678-90ab-cdef-1234567890ab"
+    assert resolve_device_identifier(udid) == udid.upper()
+
+
+def test_queries_take_the_spawn_fast_path(monkeypatch):
+    seen = {}
+
+    def _run(cmd, *_args, **kwargs):
+        seen.update(kwargs)
+        return subprocess.CompletedProcess(cmd, 1, stdout=b"", stderr=b"")
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    monkeypatch.setattr(device_utils.shutil, "which", lambda name: f"/usr/bin/{name}")
+    device_utils._resolve_executable.cache_clear()
+    try:
+        assert device_utils.is_device_booted("A") is False
+    finally:
+        device_utils._resolve_executable.cache_clear()
+    assert seen["close_fds"] is False
+    assert seen["executable"] == "/usr/bin/xcrun"
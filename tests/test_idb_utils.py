@@ -0,0 +1,21 @@
+"""Tests for shared accessibility-tree helpers in `common.idb_utils`."""
+
+import sys
+
+from common.idb_utils import count_elements
+
+
+def test_count_elements_includes_root_and_descendants():
+    tree = {"type": "Window", "children": [{"type": "Button"}, {"children": [{}, {}]}]}
+    assert count_elements(tree) == 5
+
+
+def test_count_elements_handles_trees_deeper_than_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    root = node = {"type": "Group"}
+    for _ in range(depth):
+        child = {"type": "Group"}
+        node["children"] = [child]
+        node = child
+
+    assert count_elements(root) == depth + 1
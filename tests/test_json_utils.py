@@ -0,0 +1,29 @@
+"""Tests for the optional-orjson JSON decoder shim."""
+
+import json
+
+import pytest
+from common import json_utils
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param and not json_utils.HAS_ORJSON:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_utils, "HAS_ORJSON", request.param)
+
+
+def test_decodes_bytes_and_str(backend):
+    assert json_utils.loads_json(b'[{"type": "Button"}]') == [{"type": "Button"}]
+    assert json_utils.loads_json('{"a": 1}') == {"a": 1}
+
+
+def test_invalid_json_raises_stdlib_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        json_utils.loads_json(b"not json")
+
+
+def test_dumps_round_trips(backend):
+    tree = {"type": "Button", "AXLabel": "Café", "children": []}
+    assert json.loads(json_utils.dumps_json(tree)) == tree
+    assert json_utils.dumps_json(tree, indent=True).startswith(b'{\n  "type"')
@@ -0,0 +1,385 @@
+"""Tests for `Navigator` tree flattening and element lookup.
+
+idb never runs here: the accessibility tree is injected into the navigator's
+cache, so these exercise only the Python-side walk and matching.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import navigator as navigator_module
+import pytest
+from app_launcher import AppLauncher
+from common import idb_utils, invalidate_tree_cache
+from gesture import GestureController
+from keyboard import KeyboardController
+from navigator import Element, Navigator, TreeIndex
+
+TREE = {
+    "type": "Application",
+    "AXLabel": "Demo",
+    "frame": {"x": 0, "y": 0, "width": 390, "height": 844},
+    "children": [
+        {
+            "type": "TextField",
+            "AXLabel": "Username",
+            "AXUniqueId": "usernameField",
+            "frame": {"x": 20, "y": 100, "width": 350, "height": 44},
+        },
+        {
+            "type": "Group",
+            "children": [
+                {
+                    "type": "Button",
+                    "AXLabel": "Log In",
+                    "AXUniqueId": "loginButton",
+                    "frame": {"x": 20, "y": 200, "width": 350, "height": 44},
+                },
+                {
+                    "type": "Button",
+                    "AXLabel": "Forgot password?",
+                    "enabled": False,
+                    "frame": {"x": 20, "y": 260, "width": 350, "height": 44},
+                },
+            ],
+        },
+        {
+            "type": "Button",
+            "AXLabel": "Sign Up",
+            "AXValue": "new account",
+            "frame": {"x": 20, "y": 320, "width": 350, "height": 44},
+        },
+    ],
+}
+
+
+@pytest.fixture
+def navigator():
+    nav = Navigator(udid="TEST-UDID", tree_cache=False)
+    nav._tree_cache = TREE
+    return nav
+
+
+# === flattening ===
+
+
+def test_flatten_preserves_document_order(navigator):
+    labels = [e.label for e in navigator.list_elements()]
+    assert labels == ["Demo", "Username", None, "Log In", "Forgot password?", "Sign Up"]
+
+
+def test_index_handles_trees_deeper_than_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    root = node = {"type": "Group"}
+    for _ in range(depth):
+        child = {"type": "Group"}
+        node["children"] = [child]
+        node = child
+
+    assert len(TreeIndex(root)) == depth + 1
+
+
+# === find_element ===
+
+
+def test_find_by_fuzzy_text_matches_label_or_value(navigator):
+    assert navigator.find_element(text="log in").identifier == "loginButton"
+    assert navigator.find_element(text="NEW ACC").label == "Sign Up"
+
+
+def test_find_exact_text(navigator):
+    assert navigator.find_element(text="Log", fuzzy=False) is None
+    assert navigator.find_element(text="Log In", fuzzy=False).identifier == "loginButton"
+
+
+def test_find_by_type_and_index_skips_disabled(navigator):
+    assert navigator.find_element(element_type="Button", index=1).label == "Sign Up"
+    assert navigator.find_element(element_type="Button", index=2) is None
+
+
+def test_find_by_identifier(navigator):
+    element = navigator.find_element(identifier="usernameField")
+    assert element.type == "TextField"
+    assert element.center == (195, 122)
+
+
+def test_find_negative_index_counts_from_end(navigator):
+    assert navigator.find_element(element_type="Button", index=-1).label == "Sign Up"
+    assert navigator.find_element(element_type="Button", index=-3) is None
+
+
+def test_index_is_reused_until_tree_changes(navigator):
+    first = navigator.get_index()
+    navigator.find_element(text="Sign")
+    assert navigator.get_index() is first
+
+    navigator._tree_cache = {"type": "Application", "children": [{"type": "Button"}]}
+    assert navigator.get_index() is not first
+    assert navigator.get_index().by_type == {"Application": [0], "Button": [1]}
+
+
+def test_identifier_lookup_respects_other_criteria(navigator):
+    assert navigator.find_element(identifier="loginButton", element_type="TextField") is None
+    assert navigator.find_element(identifier="loginButton", text="log").label == "Log In"
+
+
+@pytest.fixture
+def shared_ids_navigator():
+    """Rows where text/type lists are narrower than the identifier list."""
+    nav = Navigator(udid="TEST-UDID", tree_cache=False)
+    rows = [{"type": "Cell", "AXLabel": f"Row {n}", "AXUniqueId": "row"} for n in range(3)]
+    nav._tree_cache = {
+        "type": "Application",
+        "children": [*rows, {"type": "Button", "AXLabel": "Save", "AXUniqueId": "other"}],
+    }
+    return nav
+
+
+def test_identifier_checked_when_exact_text_narrows(shared_ids_navigator):
+    assert shared_ids_navigator.find_element(text="Save", identifier="row", fuzzy=False) is None
+    found = shared_ids_navigator.find_element(text="Row 1", identifier="row", fuzzy=False)
+    assert found.label == "Row 1"
+
+
+def test_identifier_checked_when_type_narrows(shared_ids_navigator):
+    assert shared_ids_navigator.find_element(element_type="Button", identifier="row") is None
+    assert (
+        shared_ids_navigator.find_element(element_type="Button", identifier="other").label == "Save"
+    )
+
+
+def test_exact_text_checked_when_identifier_narrows(shared_ids_navigator):
+    found = shared_ids_navigator.find_element(text="Save", identifier="other", fuzzy=False)
+    assert found.type == "Button"
+    assert shared_ids_navigator.find_element(text="Row 1", identifier="other", fuzzy=False) is None
+
+
+def test_type_checked_when_identifier_narrows(shared_ids_navigator):
+    assert shared_ids_navigator.find_element(element_type="Cell", identifier="other") is None
+
+
+def test_fuzzy_text_column_is_prelowercased(navigator):
+    index = navigator.get_index()
+    assert index.texts_lc[index.labels.index("Sign Up")] == "sign up new account"
+    assert navigator.find_element(text="up NEW").label == "Sign Up"
+
+
+def test_element_has_no_instance_dict(navigator):
+    assert not hasattr(navigator.find_element(text="Log In"), "__dict__")
+
+
+# === disk tree cache ===
+
+
+@pytest.fixture
+def idb_fetches(monkeypatch):
+    """Stub the idb tree fetch and count invocations."""
+    calls = []
+
+    def _fetch(udid, nested=True):
+        calls.append(udid)
+        return TREE
+
+    monkeypatch.setattr(navigator_module, "get_accessibility_tree", _fetch)
+    return calls
+
+
+def test_fresh_disk_tree_is_shared_across_navigators(tmp_path, idb_fetches):
+    Navigator(udid="TEST-UDID", tree_cache_dir=tmp_path).get_accessibility_tree()
+    tree = Navigator(udid="TEST-UDID", tree_cache_dir=tmp_path).get_accessibility_tree()
+    assert tree == TREE
+    assert len(idb_fetches) == 1
+
+
+def test_stale_disk_tree_is_refetched(tmp_path, idb_fetches):
+    Navigator(udid="TEST-UDID", tree_cache_dir=tmp_path).get_accessibility_tree()
+    os.utime(tmp_path / "tree-TEST-UDID.json", (0, 0))
+
+    Navigator(udid="TEST-UDID", tree_cache_dir=tmp_path).get_accessibility_tree()
+    assert len(idb_fetches) == 2
+
+
+def test_tree_cache_disabled_always_fetches(tmp_path, idb_fetches):
+    for _ in range(2):
+        nav = Navigator(udid="TEST-UDID", tree_cache=False, tree_cache_dir=tmp_path)
+        nav.get_accessibility_tree()
+    assert len(idb_fetches) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_tap_invalidates_disk_tree(tmp_path, idb_fetches, monkeypatch):
+    monkeypatch.setattr(
+        subprocess, "run", lambda cmd, *_a, **_k: subprocess.CompletedProcess(cmd, 0)
+    )
+    nav = Navigator(udid="TEST-UDID", tree_cache_dir=tmp_path)
+    nav.find_and_tap(text="Log In")
+    assert not (tmp_path / "tree-TEST-UDID.json").exists()
+
+
+@pytest.mark.parametrize(
+    "action",
+    [
+        lambda: GestureController(udid="TEST-UDID").swipe_between((10, 500), (10, 100)),
+        lambda: KeyboardController(udid="TEST-UDID").press_key("return"),
+        lambda: AppLauncher(udid="TEST-UDID").launch("com.example.app"),
+    ],
+    ids=["gesture", "keyboard", "launch"],
+)
+def test_ui_actions_in_other_scripts_invalidate_disk_tree(idb_fetches, monkeypatch, action):
+    monkeypatch.setattr(
+        subprocess, "run", lambda cmd, *_a, **_k: subprocess.CompletedProcess(cmd, 0, "{}")
+    )
+    Navigator(udid="TEST-UDID").get_accessibility_tree()
+    action()
+    Navigator(udid="TEST-UDID").get_accessibility_tree()
+    assert len(idb_fetches) == 2
+
+
+def test_invalidate_without_udid_clears_every_device(idb_fetches):
+    for udid in ("A", "B"):
+        Navigator(udid=udid).get_accessibility_tree()
+    invalidate_tree_cache()
+    assert list(idb_utils.TREE_CACHE_DIR.iterdir()) == []
+
+
+# === batch ===
+
+
+@pytest.fixture
+def idb_actions(monkeypatch):
+    """Stub idb tap/text and record each command."""
+    calls = []
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    monkeypatch.setattr(navigator_module, "TAP_SETTLE_SECONDS", 0)
+    return calls
+
+
+def test_batch_runs_ops_against_one_tree(navigator, idb_actions):
+    results = navigator.run_batch(
+        [
+            {"op": "enter_text", "find_id": "usernameField", "text": "bob"},
+            {"op": "tap", "find_exact": "Log In"},
+            {"op": "tap_at", "x": 10, "y": 20},
+        ]
+    )
+    assert [r["success"] for r in results] == [True, True, True]
+    assert results[1]["message"] == 'Tapped: Button "Log In" at (195, 222)'
+    assert [cmd[:3] for cmd in idb_actions] == [
+        ["idb", "ui", "tap"],
+        ["idb", "ui", "text"],
+        ["idb", "ui", "tap"],
+        ["idb", "ui", "tap"],
+    ]
+
+
+def test_batch_stops_at_first_failure(navigator, idb_actions):
+    results = navigator.run_batch(
+        [{"op": "tap", "find_text": "Nope"}, {"op": "tap", "find_text": "Log In"}]
+    )
+    assert results == [{"op": "tap", "success": False, "message": "Element not found"}]
+    assert idb_actions == []
+
+
+def test_batch_rejects_unknown_op(navigator):
+    assert navigator.run_batch([{"op": "swipe"}])[0]["message"] == "Unknown op: 'swipe'"
+
+
+@pytest.mark.parametrize("index", ["1", 1.5, True, None])
+def test_batch_rejects_non_integer_index(navigator, index):
+    results = navigator.run_batch([{"op": "find", "find_text": "Log In", "index": index}])
+    assert results == [{"op": "find", "success": False, "message": "index must be an integer"}]
+
+
+# === focus wait ===
+
+
+def _describe_all(nodes):
+    return subprocess.CompletedProcess([], 0, stdout=json.dumps(nodes), stderr="")
+
+
+_EMAIL_FRAME = {"x": 20.0, "y": 100.0, "width": 350.0, "height": 44.0}
+_PASSWORD_FRAME = {"x": 20.0, "y": 160.0, "width": 350.0, "height": 44.0}
+
+
+def _field(frame, identifier=None, **focus):
+    return {"type": "TextField", "frame": frame, "AXUniqueId": identifier, **focus}
+
+
+def _tapped(frame, identifier=None):
+    return Element("TextField", None, None, identifier, frame, [])
+
+
+def test_focus_wait_returns_once_field_is_focused(navigator, monkeypatch):
+    responses = iter(
+        [
+            [_field(_EMAIL_FRAME, AXFocused=False)],
+            [_field(_EMAIL_FRAME, AXFocused=True)],
+        ]
+    )
+    monkeypatch.setattr(subprocess, "run", lambda *_a, **_k: _describe_all(next(responses)))
+    monkeypatch.setattr(navigator_module, "TAP_SETTLE_SECONDS", 5.0)
+    monkeypatch.setattr(navigator_module, "FOCUS_POLL_SECONDS", 0.0)
+
+    assert navigator._wait_for_focus(_tapped(_EMAIL_FRAME)) is True
+
+
+def test_focus_wait_matches_by_identifier(navigator, monkeypatch):
+    moved = {**_EMAIL_FRAME, "y": 40.0}  # scrolled above the keyboard
+    tree = [_field(moved, "email", AXFocused=True)]
+    monkeypatch.setattr(subprocess, "run", lambda *_a, **_k: _describe_all(tree))
+    monkeypatch.setattr(navigator_module, "TAP_SETTLE_SECONDS", 5.0)
+
+    assert navigator._wait_for_focus(_tapped(_EMAIL_FRAME, "email")) is True
+
+
+def test_focus_on_another_element_does_not_count(navigator, monkeypatch):
+    tree = [
+        _field(_EMAIL_FRAME, "email", AXFocused=True),
+        _field(_PASSWORD_FRAME, "password", AXFocused=False),
+    ]
+    monkeypatch.setattr(subprocess, "run", lambda *_a, **_k: _describe_all(tree))
+    monkeypatch.setattr(navigator_module, "TAP_SETTLE_SECONDS", 0.05)
+    monkeypatch.setattr(navigator_module, "FOCUS_POLL_SECONDS", 0.01)
+
+    assert navigator._wait_for_focus(_tapped(_PASSWORD_FRAME, "password")) is False
+
+
+def test_focus_wait_gives_up_at_deadline(navigator, monkeypatch):
+    tree = [_field(_EMAIL_FRAME, hasKeyboardFocus=False)]
+    monkeypatch.setattr(subprocess, "run", lambda *_a, **_k: _describe_all(tree))
+    monkeypatch.setattr(navigator_module, "TAP_SETTLE_SECONDS", 0.05)
+    monkeypatch.setattr(navigator_module, "FOCUS_POLL_SECONDS", 0.01)
+
+    assert navigator._wait_for_focus(_tapped(_EMAIL_FRAME)) is False
+
+
+def test_focus_wait_without_focus_keys_sleeps_settle_time(navigator, monkeypatch):
+    calls = []
+
+    def _run(*_a, **_k):
+        calls.append(1)
+        return _describe_all([_field(_EMAIL_FRAME)])
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    monkeypatch.setattr(navigator_module, "TAP_SETTLE_SECONDS", 0.1)
+    monkeypatch.setattr(navigator_module, "FOCUS_POLL_SECONDS", 0.0)
+
+    start = time.monotonic()
+    assert navigator._wait_for_focus(_tapped(_EMAIL_FRAME)) is False
+    assert time.monotonic() - start >= 0.1
+    assert len(calls) == 1
+
+
+def test_exact_text_index_covers_label_and_value(navigator):
+    index = navigator.get_index()
+    assert index.by_text["new account"] == index.by_text["Sign Up"]
+    assert navigator.find_element(text="new account", fuzzy=False).label == "Sign Up"
+    assert navigator.find_element(text="Sign Up", element_type="TextField", fuzzy=False) is None
@@ -0,0 +1,46 @@
+"""Tests for `OutputFormatter` diagnostic formatting.
+
+Agents parse this text, so the exact layout is pinned here.
+"""
+
+from xcode.reporter import OutputFormatter
+
+
+def test_format_errors_layout_and_overflow():
+    errors = [
+        {"message": "bad", "location": {"file": "file:///src/A.swift", "line": 3}},
+        {"message": "worse", "location": {"line": 9}},
+        {"message": "hidden", "location": {}},
+    ]
+    assert OutputFormatter.format_errors(errors, limit=2) == (
+        "Errors (3):\n\n"
+        "1. bad\n   Location: /src/A.swift:line 3\n\n"
+        "2. worse\n   Location: line 9\n\n"
+        "... and 1 more errors"
+    )
+
+
+def test_format_warnings_without_location():
+    warnings = [{"message": "meh", "location": {}}]
+    assert OutputFormatter.format_warnings(warnings) == (
+        "Warnings (1):\n\n1. meh\n   Location: unknown location\n"
+    )
+    assert OutputFormatter.format_warnings([]) == "No warnings found."
+
+
+def test_format_log_keeps_tail_and_total():
+    log = "\n".join(f"line {i}" for i in range(1, 101)) + "\n"
+    assert OutputFormatter.format_log(log, lines=3) == (
+        "... (showing last 3 lines of 100)\n\nline 98\nline 99\nline 100"
+    )
+    assert OutputFormatter.format_log("a\nb\n", lines=3) == "a\nb\n"
+
+
+def test_format_minimal_success_is_one_line():
+    assert OutputFormatter.format_minimal("SUCCESS", 0, 2, "xcresult-1") == (
+        "Build: SUCCESS (0 errors, 2 warnings) [xcresult-1]"
+    )
+    tests = {"total": 4, "passed": 3, "failed": 1, "duration": 2.04}
+    assert OutputFormatter.format_minimal("FAILED", 0, 0, "xcresult-2", test_info=tests) == (
+        "Tests: FAIL (3/4 passed, 2.0s) [xcresult-2]"
+    )
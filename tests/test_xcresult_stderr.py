@@ -0,0 +1,219 @@
+"""Tests for `XCResultParser` stderr fallback, summary and issue parsing.
+
+When xcodebuild fails before producing an xcresult bundle (bad destination,
+signing, provisioning) the only diagnostics are on stderr. These tests pin the
+error classification so pattern tweaks stay behaviour-preserving.
+"""
+
+import subprocess
+
+from xcode import XCResultCache
+from xcode.xcresult import XCResultParser
+
+
+def _errors(stderr: str) -> list[dict]:
+    return XCResultParser(None, stderr=stderr)._parse_stderr_errors()
+
+
+# === classification ===
+
+
+def test_empty_stderr_yields_no_errors():
+    assert _errors("") == []
+
+
+def test_compilation_error_carries_location():
+    errors = _errors("/src/App/View.swift:135:59: error: cannot find 'foo' in scope\n")
+    assert errors == [
+        {
+            "message": "cannot find 'foo' in scope",
+            "type": "compilation",
+            "location": {"file": "/src/App/View.swift", "line": 135, "column": 59},
+        }
+    ]
+
+
+def test_xcodebuild_error_joins_continuation_lines():
+    stderr = (
+        "xcodebuild: error: Unable to find a destination matching the provided destination "
+        "specifier:\n\t\t{ platform:iOS Simulator, name:iPhone 99 }\n\n"
+    )
+    errors = _errors(stderr)
+    assert len(errors) == 1
+    assert errors[0]["type"] == "build"
+    assert "{ platform:iOS Simulator, name:iPhone 99 }" in errors[0]["message"]
+    assert "\n" not in errors[0]["message"]
+
+
+def test_signing_error_is_case_insensitive():
+    errors = _errors("ERROR: Code Signing failed for target App\n")
+    assert [e["type"] for e in errors] == ["signing"]
+
+
+def test_no_profiles_error_names_bundle_id():
+    errors = _errors("No profiles for 'com.example.app' were found\n")
+    assert errors[-1]["type"] == "provisioning"
+    assert "com.example.app" in errors[-1]["message"]
+
+
+def test_generic_error_only_when_nothing_specific_matched():
+    assert [e["type"] for e in _errors("error: something broke\n")] == ["build"]
+
+    specific = _errors("/a.swift:1:1: error: bad\nerror: something broke\n")
+    assert [e["type"] for e in specific] == ["compilation"]
+
+
+# === test summary ===
+
+
+def test_test_summary_normalizes_xcresulttool_keys(tmp_path, monkeypatch):
+    parser = XCResultParser(tmp_path)
+    monkeypatch.setattr(
+        parser,
+        "_run_xcresulttool",
+        lambda *_a, **_k: {
+            "result": "Failed",
+            "totalTestCount": 12,
+            "passedTests": 9,
+            "failedTests": 2,
+            "skippedTests": 1,
+            "startTime": 1700000000.25,
+            "finishTime": 1700000004.75,
+        },
+    )
+    assert parser.get_test_summary() == {
+        "total": 12,
+        "passed": 9,
+        "failed": 2,
+        "skipped": 1,
+        "duration": 4.5,
+    }
+
+
+def test_test_summary_none_without_results(tmp_path, monkeypatch):
+    parser = XCResultParser(tmp_path)
+    monkeypatch.setattr(parser, "_run_xcresulttool", lambda *_a, **_k: None)
+    assert parser.get_test_summary() is None
+
+
+# === xcresulttool memo ===
+
+
+def test_build_results_exported_once_per_parser(tmp_path, monkeypatch):
+    calls = []
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd)
+        payload = b'{"errors": [{"message": "boom"}], "warnings": []}'
+        return subprocess.CompletedProcess(cmd, 0, stdout=payload, stderr=b"")
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    parser = XCResultParser(tmp_path)
+    assert parser.count_issues() == (1, 0)
+    assert parser.get_errors()[0]["message"] == "boom"
+    assert parser.get_warnings() == []
+    assert len(calls) == 1
+
+
+def test_legacy_issue_layout(tmp_path, monkeypatch):
+    issue = {
+        "message": {"_value": "deprecated"},
+        "issueType": {"_value": "Deprecation"},
+        "documentLocationInCreatingWorkspace": {"url": {"_value": "file:///a.swift"}},
+    }
+    legacy = {
+        "actions": {
+            "_values": [
+                {"buildResult": {"issues": {"warningSummaries": {"_values": [issue, issue]}}}}
+            ]
+        }
+    }
+    parser = XCResultParser(tmp_path)
+    monkeypatch.setattr(parser, "_run_xcresulttool", lambda *_a, **_k: legacy)
+    assert parser.count_issues() == (0, 2)
+    assert parser.get_errors() == []
+    assert parser.get_warnings()[0]["message"] == "deprecated"
+    assert parser.get_warnings()[0]["location"]["file"] == "file:///a.swift"
+
+
+def test_stderr_without_error_tokens_is_clean():
+    assert _errors("warning: unused variable 'x'\n** BUILD SUCCEEDED **\n") == []
+
+
+def test_xcresulttool_output_persists_across_parsers(tmp_path, monkeypatch):
+    cache = XCResultCache(cache_dir=tmp_path)
+    bundle = cache.get_path("xcresult-1")
+    bundle.mkdir()
+    (bundle / "Info.plist").write_text("<plist/>")
+    calls = []
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=b'{"errors": [], "warnings": []}')
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    assert XCResultParser(bundle, cache=cache).count_issues() == (0, 0)
+    assert XCResultParser(bundle, cache=cache).count_issues() == (0, 0)
+    assert len(calls) == 1
+
+    # Rewriting the bundle invalidates the stored output; cleanup removes it
+    (bundle / "Info.plist").write_text("<plist>rewritten</plist>")
+    XCResultParser(bundle, cache=cache).count_issues()
+    assert len(calls) == 2
+    assert cache.cleanup(keep_recent=0) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unparseable_output_is_not_persisted(tmp_path, monkeypatch):
+    cache = XCResultCache(cache_dir=tmp_path)
+    bundle = cache.get_path("xcresult-1")
+    bundle.mkdir()
+    (bundle / "Info.plist").write_text("<plist/>")
+    outputs = iter([b'{"errors": [', b'{"errors": [], "warnings": []}'])
+    calls = []
+
+    def _run(cmd, *_args, **_kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=next(outputs))
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    assert XCResultParser(bundle, cache=cache).build_results is None
+    assert XCResultParser(bundle, cache=cache).count_issues() == (0, 0)
+    assert XCResultParser(bundle, cache=cache).count_issues() == (0, 0)
+    assert len(calls) == 2
+
+
+def test_text_output_is_decoded(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        subprocess,
+        "run",
+        lambda cmd, *_a, **_k: subprocess.CompletedProcess(cmd, 0, stdout="Build ✓\n".encode()),
+    )
+    assert XCResultParser(tmp_path).get_build_log() == "Build ✓\n"
+
+
+def test_export_properties_are_computed_once(tmp_path, monkeypatch):
+    calls = []
+    parser = XCResultParser(tmp_path)
+    monkeypatch.setattr(parser, "_run_xcresulttool", lambda args, **_k: calls.append(args) or "")
+    assert parser.get_build_log() is None
+    assert parser.build_log is None
+    assert parser.get_build_results() == ""
+    assert parser.build_results == ""
+    assert len(calls) == 2
+
+
+def test_legacy_location_fields_are_optional():
+    parser = XCResultParser(None)
+    issue = {"documentLocationInCreatingWorkspace": {"startingLineNumber": {"_value": 12}}}
+    assert parser._extract_location(issue) == {"file": None, "line": 12, "column": None}
+    assert parser._extract_location({}) == {"file": None, "line": None, "column": None}
+
+
+def test_green_build_falls_back_to_stderr_only_for_errors(tmp_path, monkeypatch):
+    parser = XCResultParser(tmp_path, stderr="error: linker failed\n")
+    monkeypatch.setattr(
+        parser, "_run_xcresulttool", lambda *_a, **_k: {"errors": [], "actions": {}}
+    )
+    assert [e["message"] for e in parser.get_errors()] == ["linker failed"]
+    assert parser.get_warnings() == []